@@ -24,12 +24,20 @@ Protocol:
     - format: "jpeg"のみ対応（省略可、デフォルト: jpeg）
     - quality: 1-100（省略可、デフォルト: 環境変数 CAPTURE_JPEG_QUALITY または 80）
     - save: サーバーにも保存するか（省略可、デフォルト: false）
+      ⚠️ 保存は背景タスクが非同期に行う。レスポンスの path は保存先の確定値だが、
+      ファイル自体は応答の直後にはまだ書き込み中のことがある（通常は数十ms以内に完了）
     - wait_for_new_frame: true の場合「次のフレーム」を最大5秒待つ（省略可、デフォルト: false）
 
-- server -> client (text JSON):
-    {"type": "capture_result", "capture_id": "...", "width": 1080, "height": 1920, ...}
+- client -> server (binary, 高速パス): [opcode][quality?]（1〜2バイト）
+    - opcode: bit0 (0x01) = capture、bit1 (0x02) = save（0x01 / 0x03 のみ有効）
+    - 2バイト目（省略可）: quality 1-100
+    - JSON の parse を丸ごと省略できる。wait_for_new_frame が必要な場合は JSON を使う
 
-- server -> client (binary): JPEG bytes
+- server -> client (binary): 1キャプチャ = 1フレーム
+    [4 bytes big-endian header_len][header JSON bytes][JPEG bytes]
+    - header JSON: {"type": "capture_result", "capture_id": "...", "width": 1080, "height": 1920, ...}
+    - ヘッダとJPEGを1フレームに結合することで、キャプチャごとのWSフレーム数と
+      syscall / TCPセグメント数を半減させる
 
 エラーレスポンス:
     {"type": "error", "code": "UNSUPPORTED_FORMAT", "message": "..."}
@@ -39,8 +47,11 @@ Protocol:
 from __future__ import annotations
 
 import logging
+import struct
 from typing import Any
 
+import msgspec
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.services.capture_manager import CaptureManager
@@ -50,19 +61,42 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-
-def _as_capture_result_dict(result: Any) -> dict[str, Any]:
-    # Avoid importing pydantic for WS-only payload.
-    return {
-        "type": "capture_result",
-        "capture_id": result.capture_id,
-        "captured_at": result.captured_at,
-        "serial": result.serial,
-        "width": result.width,
-        "height": result.height,
-        "bytes": result.bytes,
-        "path": result.path,
+# 固定内容のエラーペイロードは import 時に一度だけエンコードする。
+# 動的な message を含むもの（UNSUPPORTED_FORMAT / CAPTURE_FAILED）のみ毎回エンコード。
+_ERR_TIMEOUT_TEXT = orjson.dumps(
+    {
+        "type": "error",
+        "code": "CAPTURE_TIMEOUT",
+        "message": "Timed out waiting for a decoded frame",
     }
+).decode()
+_ERR_BAD_REQUEST_TEXT = orjson.dumps(
+    {"type": "error", "code": "BAD_REQUEST", "message": "Unknown message type"}
+).decode()
+
+
+class _CaptureRequest(msgspec.Struct):
+    """capture リクエスト（JSON パス）のスキーマ。
+
+    msgspec は JSON bytes から C 速度で直接 Struct を構築し、型検証も同時に
+    行う（dict を経由しないため per-message の dict 確保と get() 連鎖が消える）。
+    型不一致は DecodeError になり、そのまま BAD_REQUEST を返せる。
+    """
+
+    type: str
+    format: str = "jpeg"
+    quality: int | None = None
+    save: bool = False
+    wait_for_new_frame: bool = False
+
+
+_capture_decoder = msgspec.json.Decoder(_CaptureRequest)
+
+
+async def _send_json_fast(websocket: WebSocket, payload: dict[str, Any]) -> None:
+    # orjson は stdlib json より数倍速い（C実装・中間strなし）。
+    # send_json() は内部で json.dumps を使うため、ホットパスでは使わない。
+    await websocket.send_text(orjson.dumps(payload).decode())
 
 
 @router.websocket("/ws/capture/{serial}")
@@ -90,30 +124,69 @@ async def websocket_capture(websocket: WebSocket, serial: str) -> None:
         await worker_registry.on_capture_connect(serial)
     logger.info(f"WebSocket capture started for {serial}")
 
+    # 結合フレーム組み立て用のスクラッチバッファ（接続ごとに再利用）。
+    # キャプチャは接続内で直列なので、毎回 bytearray を確保し直さず使い回せる。
+    frame_scratch = bytearray()
+
+    # ホットループでは Starlette のラッパメソッドを介さず生の ASGI イベントを使う
+    # （echo エンドポイントと同じ扱い。dict イベント1層 + 属性参照を削る）。
+    receive = websocket.receive
+    send = websocket.send
+
     try:
         while True:
+            # receive_json() は UTF-8 decode + stdlib json.loads を毎回行うため、
+            # 生の ASGI イベントを受けて orjson で直接 parse する。
             try:
-                data = await websocket.receive_json()
+                message = await receive()
             except WebSocketDisconnect:
                 break
+            if message["type"] == "websocket.disconnect":
+                break
 
-            msg_type = data.get("type")
-            if msg_type == "capture":
-                fmt = (data.get("format") or "jpeg").lower()
-                if fmt != "jpeg":
-                    await websocket.send_json(
-                        {
-                            "type": "error",
-                            "code": "UNSUPPORTED_FORMAT",
-                            "message": f"format {fmt} is not supported",
-                        }
-                    )
+            raw = message.get("bytes")
+
+            # バイナリトリガ高速パス: [opcode][quality?]（1〜2バイト）。
+            # bit0 (0x01) = capture、bit1 (0x02) = save。JSON parse を丸ごと省略する。
+            # 認識できないバイナリは JSON パスに落ちて BAD_REQUEST になる。
+            is_capture = False
+            quality: Any = None
+            save = False
+            wait_for_new_frame = False
+            if raw is not None and 1 <= len(raw) <= 2 and raw[0] in (0x01, 0x03):
+                is_capture = True
+                save = bool(raw[0] & 0x02)
+                if len(raw) == 2:
+                    quality = raw[1]
+            else:
+                if raw is None:
+                    raw = message.get("text", "")
+                try:
+                    req = _capture_decoder.decode(raw)
+                except msgspec.DecodeError:
+                    # JSON 壊れ・object でない・型不一致のいずれも同じ扱い
+                    await websocket.send_text(_ERR_BAD_REQUEST_TEXT)
                     continue
 
-                quality = data.get("quality")
-                save = bool(data.get("save", False))
-                wait_for_new_frame = bool(data.get("wait_for_new_frame", False))
-
+                if req.type == "capture":
+                    fmt = req.format.lower()
+                    if fmt != "jpeg":
+                        await _send_json_fast(
+                            websocket,
+                            {
+                                "type": "error",
+                                "code": "UNSUPPORTED_FORMAT",
+                                "message": f"format {fmt} is not supported",
+                            },
+                        )
+                        continue
+
+                    is_capture = True
+                    quality = req.quality
+                    save = req.save
+                    wait_for_new_frame = req.wait_for_new_frame
+
+            if is_capture:
                 try:
                     result, jpeg = await worker.capture_jpeg(
                         quality=quality,
@@ -122,31 +195,41 @@ async def websocket_capture(websocket: WebSocket, serial: str) -> None:
                         wait_timeout_sec=5.0,
                     )
                 except TimeoutError:
-                    await websocket.send_json(
-                        {
-                            "type": "error",
-                            "code": "CAPTURE_TIMEOUT",
-                            "message": "Timed out waiting for a decoded frame",
-                        }
-                    )
+                    await websocket.send_text(_ERR_TIMEOUT_TEXT)
                     continue
                 except Exception as e:
-                    await websocket.send_json(
-                        {"type": "error", "code": "CAPTURE_FAILED", "message": str(e)}
+                    await _send_json_fast(
+                        websocket,
+                        {"type": "error", "code": "CAPTURE_FAILED", "message": str(e)},
                     )
                     continue
 
-                await websocket.send_json(_as_capture_result_dict(result))
-                await websocket.send_bytes(jpeg)
-
-            else:
-                await websocket.send_json(
+                # ホットパス: ヘルパ経由の属性コピーを挟まず、その場で dict を組んで encode する。
+                # ヘッダとJPEGを1バイナリフレームに結合して送る
+                # ([4B BE header_len][header][jpeg])。フレーム分割による余分な
+                # syscall・TCPセグメント・await 境界を1キャプチャあたり1回分削る。
+                hdr = orjson.dumps(
                     {
-                        "type": "error",
-                        "code": "BAD_REQUEST",
-                        "message": "Unknown message type",
+                        "type": "capture_result",
+                        "capture_id": result.capture_id,
+                        "captured_at": result.captured_at,
+                        "serial": result.serial,
+                        "width": result.width,
+                        "height": result.height,
+                        "bytes": result.bytes,
+                        "path": result.path,
                     }
                 )
+                # `+` 連結は中間オブジェクトを作って2回コピーするため、
+                # 再利用バッファに extend で詰める（jpeg は memoryview のままコピー1回）。
+                frame_scratch.clear()
+                frame_scratch.extend(struct.pack(">I", len(hdr)))
+                frame_scratch.extend(hdr)
+                frame_scratch.extend(jpeg)
+                await send({"type": "websocket.send", "bytes": frame_scratch})
+
+            else:
+                await websocket.send_text(_ERR_BAD_REQUEST_TEXT)
 
     finally:
         await capture_manager.release(serial)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 
 from app.api.schemas.device import Device
 from app.services.device_manager import get_device_manager
@@ -11,10 +12,13 @@ router = APIRouter()
 
 
 @router.get("/devices", response_model=list[Device], summary="List connected devices")
-async def list_devices() -> list[dict]:
+async def list_devices() -> Response:
+    # シリアライズ済みキャッシュをそのまま返す（変更時のみ再生成される）
     device_manager = get_device_manager()
-    devices = await device_manager.list_devices()
-    return [d.to_dict() for d in devices]
+    return Response(
+        content=await device_manager.list_devices_json(),
+        media_type="application/json",
+    )
 
 
 @router.get("/devices/{serial}", response_model=Device, summary="Get device info")
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import json
-
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 
@@ -27,9 +25,8 @@ async def events() -> StreamingResponse:
 
     async def event_generator():
         device_manager = get_device_manager()
-        devices = await device_manager.list_devices()
-        data = json.dumps([d.to_dict() for d in devices])
-        yield f"event: devices\ndata: {data}\n\n"
+        data = await device_manager.list_devices_json()
+        yield f"event: devices\ndata: {data.decode()}\n\n"
 
         async for message in sse_manager.subscribe():
             yield message
@@ -45,13 +45,26 @@ async def websocket_echo(websocket: WebSocket) -> None:
     logger.info("Echo WebSocket connected")
     echo_count = 0
 
+    # receive_bytes()/send_bytes() の dict イベントラップを1層落とす。
+    # 小さなペイロードの高頻度エコーでは、この層のオーバーヘッドが支配的になる。
+    receive = websocket.receive
+    send = websocket.send
+    out_msg: dict = {"type": "websocket.send", "bytes": b""}
+
     try:
         while True:
-            data = await websocket.receive_bytes()
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                logger.info(f"Echo WebSocket disconnected. total_echoes={echo_count}")
+                return
+            data = message.get("bytes")
+            if data is None:
+                continue
             recv_t = time.perf_counter()
 
-            # エコー送信
-            await websocket.send_bytes(data)
+            # エコー送信（送信イベント dict は再利用）
+            out_msg["bytes"] = data
+            await send(out_msg)
             send_t = time.perf_counter()
 
             echo_count += 1
@@ -102,38 +115,49 @@ async def websocket_synthetic_stream(
     interval = 1.0 / fps
     seq = 0
     total_bytes = 0
+    overruns = 0
     start_time = time.perf_counter()
     end_time = start_time + duration_sec
+    # 絶対スケジュール: 相対 sleep(interval - elapsed) は誤差が累積し、
+    # 計測したい send_ms にスケジューラのドリフトが混入する。
+    next_t = start_time + interval
 
-    # 固定ペイロード（ゼロ埋め）
-    payload_body = bytes(payload_size - 16)  # 16 = seq(8) + gen_t(8)
+    # ペイロードバッファは1回だけ確保し、毎フレーム先頭16バイト（seq + gen_t）のみ
+    # 書き換える。bytes 連結だと 120fps × payload_size のアロケーション+コピーが発生する。
+    buf = bytearray(payload_size)  # 本体はゼロ埋めのまま
+    mv = memoryview(buf)
 
     try:
         while time.perf_counter() < end_time:
             gen_t = time.perf_counter()
             seq += 1
 
-            # ペイロード構築: seq(8) + gen_t(8) + body
-            header = struct.pack(">Qd", seq, gen_t)
-            data = header + payload_body
+            # ヘッダをin-placeで更新: seq(8) + gen_t(8)
+            struct.pack_into(">Qd", buf, 0, seq, gen_t)
 
-            await websocket.send_bytes(data)
+            await websocket.send_bytes(mv)
             send_done_t = time.perf_counter()
 
-            total_bytes += len(data)
+            total_bytes += payload_size
             send_ms = (send_done_t - gen_t) * 1000
 
             # 30回ごとにログ出力
             if seq % 30 == 0:
                 logger.info(
-                    f"[SYNTH] seq={seq} send_ms={send_ms:.3f} payload_bytes={len(data)}"
+                    f"[SYNTH] seq={seq} send_ms={send_ms:.3f} payload_bytes={payload_size}"
                 )
 
-            # 次フレームまで待機
-            elapsed = time.perf_counter() - gen_t
-            sleep_time = interval - elapsed
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
+            # 次フレームの絶対時刻まで待機
+            sleep_for = next_t - time.perf_counter()
+            next_t += interval
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for)
+            else:
+                overruns += 1
+                if overruns % 30 == 1:
+                    logger.warning(
+                        f"[SYNTH] pacing overrun: seq={seq} behind_ms={-sleep_for * 1000:.3f}"
+                    )
 
         # 完了通知（空バイトで終了シグナル）
         await websocket.send_bytes(b"")
@@ -143,7 +167,7 @@ async def websocket_synthetic_stream(
         actual_fps = seq / elapsed_total if elapsed_total > 0 else 0
         logger.info(
             f"Synthetic stream completed: frames={seq} elapsed={elapsed_total:.2f}s "
-            f"actual_fps={actual_fps:.1f} total_bytes={total_bytes}"
+            f"actual_fps={actual_fps:.1f} total_bytes={total_bytes} overruns={overruns}"
         )
 
     except WebSocketDisconnect:
@@ -3,17 +3,20 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse
 
-from app.api.schemas.session import SessionInfo, SessionsResponse
+from app.api.schemas.session import SessionsResponse
 
 router = APIRouter()
 
 
 @router.get("/sessions", response_model=SessionsResponse, summary="List active stream sessions")
-async def list_sessions(request: Request) -> SessionsResponse:
+async def list_sessions(request: Request) -> ORJSONResponse:
+    # レスポンスは plain dict のまま orjson で返す（pydantic の
+    # モデル構築＋検証をリクエストごとに払わない。スキーマは docs 用に維持）。
     stream_manager = getattr(request.app.state, "stream_manager", None)
     if not stream_manager:
-        return SessionsResponse(sessions=[])
+        return ORJSONResponse({"sessions": []})
 
     worker_registry = getattr(request.app.state, "worker_registry", None)
     capture_manager = getattr(request.app.state, "capture_manager", None)
@@ -28,11 +31,15 @@ async def list_sessions(request: Request) -> SessionsResponse:
 
     states_by_serial = {s.serial: s for s in states}
 
-    # include sessions that are running even if registry has no entry yet
-    serials = set(stream_manager.active_sessions) | set(states_by_serial.keys())
+    # snapshot() は serial 昇順を維持しているので、通常はそのまま使える。
+    # registry にまだエントリが無い実行中セッションがある場合のみソートし直す（稀）。
+    serials: list[str] = [s.serial for s in states]
+    extra = [s for s in stream_manager.active_sessions if s not in states_by_serial]
+    if extra:
+        serials = sorted(set(serials) | set(extra))
 
-    sessions: list[SessionInfo] = []
-    for serial in sorted(serials):
+    sessions: list[dict] = []
+    for serial in serials:
         st = states_by_serial.get(serial)
 
         session = stream_manager.get_session(serial)
@@ -42,14 +49,14 @@ async def list_sessions(request: Request) -> SessionsResponse:
         capture_running = bool(capture_running_by_serial.get(serial, False))
 
         sessions.append(
-            SessionInfo(
-                serial=serial,
-                stream_running=stream_running,
-                stream_subscribers=stream_subscribers,
-                stream_clients=int(st.stream_clients) if st else 0,
-                capture_clients=int(st.capture_clients) if st else 0,
-                capture_running=capture_running,
-            )
+            {
+                "serial": serial,
+                "stream_running": stream_running,
+                "stream_subscribers": stream_subscribers,
+                "stream_clients": int(st.stream_clients) if st else 0,
+                "capture_clients": int(st.capture_clients) if st else 0,
+                "capture_running": capture_running,
+            }
         )
 
-    return SessionsResponse(sessions=sessions)
+    return ORJSONResponse({"sessions": sessions})
@@ -32,6 +32,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 小さい NAL が連続する場合にキュー内で結合する上限。WSフレーム数と syscall を
+# 削減する（待ちは入れないので遅延は増えない）。ws-max-size (8MB) に対して十分小さい値。
+_COALESCE_MAX_BYTES = 64 * 1024
+
 
 @router.websocket("/ws/stream/{serial}")
 async def websocket_stream(websocket: WebSocket, serial: str) -> None:
@@ -60,7 +64,7 @@ async def websocket_stream(websocket: WebSocket, serial: str) -> None:
 
     try:
         session = await stream_manager.get_or_create(serial)
-        async for chunk in session.subscribe():
+        async for chunk in session.subscribe(coalesce_bytes=_COALESCE_MAX_BYTES):
             if not chunk:
                 break
             await websocket.send_bytes(chunk)
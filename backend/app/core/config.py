@@ -7,23 +7,52 @@ FastAPI の "王道" 構成として core 配下に設定読み込みを集約
 from __future__ import annotations
 
 from dataclasses import dataclass
+import functools
 import os
 from pathlib import Path
 
 
-@dataclass(frozen=True)
+# scrcpy-server.jar のフォールバック候補。Path.resolve() は各パス要素を lstat する
+# ため起動パスでは高くつく。import 時に一度だけ計算して以降は再利用する
+# （__file__ が既に絶対パスなら resolve() 自体を省略できる）。
+_HERE = Path(__file__)
+_REPO_ROOT = _HERE.parents[3] if _HERE.is_absolute() else _HERE.resolve().parents[3]
+_DEFAULT_JAR_CANDIDATES = (
+    Path("/app/vendor/scrcpy-server.jar"),
+    _REPO_ROOT / "vendor" / "scrcpy-server.jar",
+)
+
+# CORS_ALLOW_ORIGINS のデフォルト（ワイルドカード）。圧倒的に多い値なので
+# split/strip の走査をスキップして共有定数を返す。
+_WILDCARD_ORIGINS = ("*",)
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """バックエンド設定"""
+    """バックエンド設定
+
+    完全に不変（tuple フィールドのみ）なのでプロセス内で安全に共有できる。
+    slots=True で長寿命インスタンスの __dict__ を持たない。
+    """
 
     scrcpy_server_jar: str
-    cors_allow_origins: list[str]
+    cors_allow_origins: tuple[str, ...]
     capture_output_dir: str
     capture_jpeg_quality: int
+    # キャプチャの長辺上限（0 = ネイティブ解像度のまま）。設定すると ffmpeg が
+    # デコード時に縮小し、以降の RAM 帯域と JPEG エンコードが (max/native)^2 で軽くなる。
+    capture_max_side: int
     stream_idle_timeout_sec: float
 
 
+@functools.lru_cache(maxsize=1)
 def load_settings() -> Settings:
-    """環境変数から Settings を生成する。"""
+    """環境変数から Settings を生成する。
+
+    環境変数はプロセス起動後に変わらない前提なので、結果はプロセス内で
+    一度だけ構築して共有する（env 再読込・パス存在確認の繰り返しを避ける）。
+    env を書き換えるテストでは ``load_settings.cache_clear()`` を呼ぶこと。
+    """
 
     scrcpy_server_jar_env = os.environ.get("SCRCPY_SERVER_JAR")
     if scrcpy_server_jar_env:
@@ -31,14 +60,14 @@ def load_settings() -> Settings:
     else:
         # Docker では /app/vendor/scrcpy-server.jar を想定しているが、ローカル実行/pytest では
         # このリポジトリ配下の vendor/ を使う。
-        candidates = [
-            Path("/app/vendor/scrcpy-server.jar"),
-            Path(__file__).resolve().parents[3] / "vendor" / "scrcpy-server.jar",
-        ]
+        candidates = _DEFAULT_JAR_CANDIDATES
         scrcpy_server_jar = str(next((p for p in candidates if p.exists()), candidates[0]))
 
     cors = os.environ.get("CORS_ALLOW_ORIGINS", "*")
-    cors_allow_origins = [o.strip() for o in cors.split(",") if o.strip()]
+    if cors.strip() == "*":
+        cors_allow_origins = _WILDCARD_ORIGINS
+    else:
+        cors_allow_origins = tuple(o.strip() for o in cors.split(",") if o.strip())
 
     # In docker-compose, backend is mounted to /app/backend (rw), and the process
     # runs with WORKDIR=/app/backend. Defaulting to a relative path makes captures
@@ -51,6 +80,10 @@ def load_settings() -> Settings:
     if capture_jpeg_quality > 100:
         capture_jpeg_quality = 100
 
+    capture_max_side = int(os.environ.get("CAPTURE_MAX_SIDE", "0"))
+    if capture_max_side < 0:
+        capture_max_side = 0
+
     stream_idle_timeout_sec = float(os.environ.get("STREAM_IDLE_TIMEOUT_SEC", "5"))
 
     return Settings(
@@ -58,5 +91,6 @@ def load_settings() -> Settings:
         cors_allow_origins=cors_allow_origins,
         capture_output_dir=capture_output_dir,
         capture_jpeg_quality=capture_jpeg_quality,
+        capture_max_side=capture_max_side,
         stream_idle_timeout_sec=stream_idle_timeout_sec,
     )
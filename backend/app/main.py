@@ -13,12 +13,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-
-from android_screen_stream import StreamConfig, StreamManager
+from fastapi.responses import ORJSONResponse
 
 from app.api.router import api_router
 from app.api.endpoints import healthz
@@ -32,30 +33,66 @@ from app.services.worker_registry import get_worker_registry
 logger = logging.getLogger(__name__)
 
 
-def _setup_device_change_notifier(app: FastAPI) -> None:
-    """デバイス変更時に SSE で通知する設定"""
+class _DeviceChangeNotifier:
+    """デバイス変更の SSE 通知（デバウンス付き）。
 
-    device_manager = get_device_manager()
-    sse_manager = get_sse_manager()
+    バースト的な ADB イベント（接続直後の state 遷移など）ごとにタスクを
+    作らず、実行中タスクが1つだけ dirty フラグを見てまとめて配信する。
+    タスクへの強参照を保持するので、参照なし create_task が GC に
+    回収されて通知が落ちる事故も起きない。
+    """
 
-    def on_device_change() -> None:
-        asyncio.create_task(notify_device_change())
+    def __init__(self, device_manager, sse_manager) -> None:
+        self._device_manager = device_manager
+        self._sse_manager = sse_manager
+        self._task: asyncio.Task[None] | None = None
+        self._dirty = False
 
-    async def notify_device_change() -> None:
-        devices = await device_manager.list_devices()
-        await sse_manager.broadcast("devices", [d.to_dict() for d in devices])
+    def on_change(self) -> None:
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
 
-    device_manager.on_change(on_device_change)
+    async def _run(self) -> None:
+        while self._dirty:
+            self._dirty = False
+            try:
+                await self._sse_manager.broadcast_serialized(
+                    "devices", await self._device_manager.list_devices_json()
+                )
+            except Exception as e:
+                logger.error(f"Device change broadcast failed: {e}")
+
+
+def _setup_device_change_notifier(app: FastAPI) -> None:
+    """デバイス変更時に SSE で通知する設定"""
+
+    notifier = _DeviceChangeNotifier(get_device_manager(), get_sse_manager())
+    # app.state に持たせて notifier（と実行中タスク）を生かしておく
+    app.state.device_change_notifier = notifier
+    get_device_manager().on_change(notifier.on_change)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    settings = load_settings()
-    app.state.settings = settings
+    # android_screen_stream はここでしか使わないので import を遅延させる
+    # （`import app.main` だけで済む場面 — Docker healthcheck 等 — を軽くする）
+    from android_screen_stream import StreamConfig, StreamManager
+
+    # create_app() で読み込んだ Settings を再利用する（CORS middleware と
+    # StreamManager が必ず同一の設定を見るようにする）
+    settings = app.state.settings
 
     logger.info("Starting services...")
     logger.info(f"Using scrcpy-server.jar: {settings.scrcpy_server_jar}")
 
+    # to_thread（JPEG エンコード等の CPU バウンド処理）をコア数で上限する。
+    # libjpeg-turbo は C 側で GIL を解放するためコア数分は並列に効くが、
+    # それ以上スレッドを増やしてもコンテキストスイッチが増えるだけ。
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="capture-encode")
+    )
+
     device_manager = get_device_manager()
     _setup_device_change_notifier(app)
     await device_manager.start()
@@ -69,6 +106,7 @@ async def lifespan(app: FastAPI):
         stream_manager=app.state.stream_manager,
         output_dir=settings.capture_output_dir,
         default_quality=settings.capture_jpeg_quality,
+        max_side=settings.capture_max_side,
     )
 
     app.state.worker_registry = get_worker_registry(
@@ -96,6 +134,8 @@ def create_app() -> FastAPI:
         description="Android デバイス画面ストリーミング & キャプチャシステム",
         version="0.1.0",
         lifespan=lifespan,
+        # JSONレスポンスのエンコードを一括で orjson にする（stdlib json の2〜5倍）
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
@@ -110,6 +150,7 @@ def create_app() -> FastAPI:
     )
 
     settings = load_settings()
+    app.state.settings = settings
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allow_origins,
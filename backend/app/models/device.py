@@ -29,12 +29,29 @@ class DeviceInfo:
     is_emulator: bool = False
     last_seen: datetime = field(default_factory=datetime.now)
 
+    # to_dict() のキャッシュ。デバイス一覧はADBイベントのたびに全デバイス分
+    # シリアライズされるため、変更のないデバイスは dict 構築と isoformat() を
+    # 繰り返さない。touch() 経由の更新で無効化される。
+    _cached_dict: Optional[dict] = field(default=None, repr=False, compare=False)
+
+    def touch(self, **changes) -> None:
+        """フィールドを更新し、to_dict() キャッシュを無効化する。"""
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self._cached_dict = None
+
     def to_dict(self) -> dict:
-        return {
-            "serial": self.serial,
-            "state": self.state.value,
-            "model": self.model,
-            "manufacturer": self.manufacturer,
-            "isEmulator": self.is_emulator,
-            "lastSeen": self.last_seen.isoformat(),
-        }
+        cached = self._cached_dict
+        if cached is None:
+            cached = {
+                "serial": self.serial,
+                # DeviceState は str を継承しているので .value の間接参照は不要。
+                # orjson は Enum を value で、stdlib json は str 部分をそのまま出す。
+                "state": self.state,
+                "model": self.model,
+                "manufacturer": self.manufacturer,
+                "isEmulator": self.is_emulator,
+                "lastSeen": self.last_seen.isoformat(),
+            }
+            self._cached_dict = cached
+        return cached
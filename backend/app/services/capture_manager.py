@@ -21,50 +21,285 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import logging
+import os
 import re
+import time
+import zlib
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 from uuid import uuid4
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Unix 以外
+    fcntl = None  # type: ignore[assignment]
+
 if TYPE_CHECKING:
     from android_screen_stream import StreamManager
 
 logger = logging.getLogger(__name__)
 
+# Linux の pipe バッファは既定 64KiB。yuv420p の 1080p フレームは約 3MB なので、
+# デコーダ stdout はフレームごとに何十回も write/wakeup/readv を往復する。
+# F_SETPIPE_SZ で 1MiB に広げて往復回数を減らす（Linux 以外・権限不足では
+# 黙って既定サイズのまま動く best-effort）。
+_PIPE_BUF_SIZE = 1 << 20
+
+
+def _grow_pipe(fd: int) -> None:
+    if fcntl is None or not hasattr(fcntl, "F_SETPIPE_SZ"):
+        return
+    try:
+        fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, _PIPE_BUF_SIZE)
+    except OSError as e:
+        # /proc/sys/fs/pipe-max-size が小さい環境など。性能最適化なので警告止まり
+        logger.debug(f"F_SETPIPE_SZ({_PIPE_BUF_SIZE}) failed for fd={fd}: {e}")
+
+# libjpeg-turbo (PyTurboJPEG) があればインプロセスの SIMD エンコードを使う。
+# ライブラリが無い環境（libturbojpeg 未インストール等）では ffmpeg にフォールバック。
+# どちらのパスで動いているかはログで判別できるようにする（サイレントに
+# 遅いフォールバックへ落ちると 1 キャプチャあたり数十 ms の差になるため）。
+try:
+    from turbojpeg import TJSAMP_420, TurboJPEG
+
+    _turbo: Optional["TurboJPEG"] = TurboJPEG()
+    logger.info("JPEG encode: libjpeg-turbo (in-process SIMD) available")
+except Exception as _e:
+    _turbo = None
+    logger.warning(f"JPEG encode: libturbojpeg unavailable ({_e}); falling back to ffmpeg")
+
 
 _RE_DIM = re.compile(r"(?P<w>\d{2,5})x(?P<h>\d{2,5})")
 
 
-def _find_sps_nal_unit(data: bytes) -> bytes | None:
-    """H.264データからSPS NAL unitを探す。解像度変更の検出に使用。"""
+def _find_sps_bounds(data: bytes) -> Optional[tuple[int, int]]:
+    """H.264データからSPS NAL unit（NALヘッダ込み）の範囲を返す。
+
+    チャンクごとに全バイトを見るホットパスなので、start code の走査は
+    C 実装の find (memchr ベース) に任せる。
+    """
+    n = len(data)
     i = 0
-    while i < len(data) - 4:
+    while True:
         # NAL start code を探す (0x00 0x00 0x00 0x01 または 0x00 0x00 0x01)
-        nal_start = -1
-        if data[i] == 0 and data[i + 1] == 0 and data[i + 2] == 0 and data[i + 3] == 1:
-            nal_start = i + 4
-        elif data[i] == 0 and data[i + 1] == 0 and data[i + 2] == 1:
-            nal_start = i + 3
-        
-        if nal_start >= 0 and nal_start < len(data):
-            nal_type = data[nal_start] & 0x1f
-            # NAL type 7 = SPS
-            if nal_type == 7:
-                # 次のstart codeまで、またはデータ終端までをSPSとして返す
-                for j in range(nal_start, len(data) - 3):
-                    if ((data[j] == 0 and data[j + 1] == 0 and data[j + 2] == 0 and data[j + 3] == 1) or
-                        (data[j] == 0 and data[j + 1] == 0 and data[j + 2] == 1)):
-                        return data[nal_start:j]
-                return data[nal_start:]
-        i += 1
-    return None
-
-
+        idx = data.find(b"\x00\x00\x01", i)
+        if idx < 0:
+            return None
+        nal_start = idx + 3
+        if nal_start >= n:
+            return None
+        # NAL type 7 = SPS
+        if (data[nal_start] & 0x1F) == 7:
+            # 次のstart codeまで、またはデータ終端までをSPSとみなす
+            nxt = data.find(b"\x00\x00\x01", nal_start)
+            if nxt < 0:
+                nxt = n
+            elif nxt > nal_start and data[nxt - 1] == 0:
+                nxt -= 1  # 4byte形式の先頭 0x00 は次のNAL側
+            return nal_start, nxt
+        i = nal_start
+
+
+class _ExpGolombReader:
+    """SPS 解析用の最小ビットリーダー（u(n) / ue(v) / se(v)）。"""
+
+    __slots__ = ("_data", "_pos")
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0  # ビット位置
+
+    def u(self, n: int) -> int:
+        v = 0
+        pos = self._pos
+        data = self._data
+        for _ in range(n):
+            v = (v << 1) | ((data[pos >> 3] >> (7 - (pos & 7))) & 1)
+            pos += 1
+        self._pos = pos
+        return v
+
+    def ue(self) -> int:
+        zeros = 0
+        while self.u(1) == 0:
+            zeros += 1
+            if zeros > 31:
+                raise ValueError("invalid exp-Golomb code")
+        return (1 << zeros) - 1 + (self.u(zeros) if zeros else 0)
+
+    def se(self) -> int:
+        k = self.ue()
+        return (k + 1) // 2 if k & 1 else -(k // 2)
+
+
+def _parse_sps_dimensions(payload: bytes) -> Optional[tuple[int, int]]:
+    """SPS の RBSP ペイロード（NAL ヘッダを除いた部分）から (width, height) を求める。
+
+    ffmpeg が stderr に "Video: ... WxH" を出すのはデコード開始後なので、
+    それを待たずに最初の SPS 到着時点で解像度を確定させるための
+    exp-Golomb デコーダ。解析できない場合は None（stderr 解析にフォールバック）。
+    """
+    try:
+        # emulation prevention bytes (00 00 03) を除去して RBSP にする
+        r = _ExpGolombReader(payload.replace(b"\x00\x00\x03", b"\x00\x00"))
+        profile_idc = r.u(8)
+        r.u(16)  # constraint flags + reserved + level_idc
+        r.ue()  # seq_parameter_set_id
+        chroma_format_idc = 1
+        if profile_idc in (100, 110, 122, 244, 44, 83, 86, 118, 128, 138, 139, 134, 135):
+            chroma_format_idc = r.ue()
+            if chroma_format_idc == 3:
+                r.u(1)  # separate_colour_plane_flag
+            r.ue()  # bit_depth_luma_minus8
+            r.ue()  # bit_depth_chroma_minus8
+            r.u(1)  # qpprime_y_zero_transform_bypass_flag
+            if r.u(1):  # seq_scaling_matrix_present_flag
+                for i in range(8 if chroma_format_idc != 3 else 12):
+                    if r.u(1):  # seq_scaling_list_present_flag[i]
+                        last_scale = next_scale = 8
+                        for _ in range(16 if i < 6 else 64):
+                            if next_scale != 0:
+                                next_scale = (last_scale + r.se() + 256) % 256
+                            if next_scale != 0:
+                                last_scale = next_scale
+        r.ue()  # log2_max_frame_num_minus4
+        poc_type = r.ue()
+        if poc_type == 0:
+            r.ue()  # log2_max_pic_order_cnt_lsb_minus4
+        elif poc_type == 1:
+            r.u(1)  # delta_pic_order_always_zero_flag
+            r.se()  # offset_for_non_ref_pic
+            r.se()  # offset_for_top_to_bottom_field
+            for _ in range(r.ue()):
+                r.se()
+        r.ue()  # max_num_ref_frames
+        r.u(1)  # gaps_in_frame_num_value_allowed_flag
+        pic_width_in_mbs = r.ue() + 1
+        pic_height_in_map_units = r.ue() + 1
+        frame_mbs_only = r.u(1)
+        if not frame_mbs_only:
+            r.u(1)  # mb_adaptive_frame_field_flag
+        r.u(1)  # direct_8x8_inference_flag
+        crop_l = crop_r = crop_t = crop_b = 0
+        if r.u(1):  # frame_cropping_flag
+            crop_l = r.ue()
+            crop_r = r.ue()
+            crop_t = r.ue()
+            crop_b = r.ue()
+        # クロップ単位は chroma format 依存（4:2:0 では x2）
+        if chroma_format_idc == 0:
+            unit_x, unit_y = 1, 2 - frame_mbs_only
+        elif chroma_format_idc == 1:
+            unit_x, unit_y = 2, 2 * (2 - frame_mbs_only)
+        elif chroma_format_idc == 2:
+            unit_x, unit_y = 2, 2 - frame_mbs_only
+        else:
+            unit_x, unit_y = 1, 2 - frame_mbs_only
+        width = pic_width_in_mbs * 16 - (crop_l + crop_r) * unit_x
+        height = (2 - frame_mbs_only) * pic_height_in_map_units * 16 - (crop_t + crop_b) * unit_y
+        if width <= 0 or height <= 0:
+            return None
+        return width, height
+    except (IndexError, ValueError):
+        return None
+
+
+# ffmpeg -hwaccels の検出結果（プロセス内で一度だけ調べる）
+_hwaccel_checked = False
+_hwaccel: Optional[str] = None
+
+# 優先順。H.264 デコードをサポートし、デコードを CPU から完全に外せるもの。
+_HWACCEL_PREFERENCE = ("cuda", "vaapi", "videotoolbox")
+
+
+async def _detect_hwaccel() -> Optional[str]:
+    """利用可能なハードウェアデコーダを検出する（結果はキャッシュ）。
+
+    `-hwaccel <name>` は init に失敗した場合 ffmpeg 側でソフトウェアデコードに
+    フォールバックするため、検出に通った名前をそのまま注入して安全。
+    出力は従来どおり yuv420p rawvideo（フレームは自動で system memory に降りる）。
+    """
+    global _hwaccel_checked, _hwaccel
+    if _hwaccel_checked:
+        return _hwaccel
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-hide_banner",
+            "-hwaccels",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await proc.communicate()
+        available = {line.strip() for line in stdout.decode().splitlines()}
+        _hwaccel = next((n for n in _HWACCEL_PREFERENCE if n in available), None)
+    except Exception as e:
+        logger.warning(f"hwaccel detection failed, using software decode: {e}")
+        _hwaccel = None
+
+    _hwaccel_checked = True
+    if _hwaccel:
+        logger.info(f"Using ffmpeg hwaccel for H.264 decode: {_hwaccel}")
+    else:
+        logger.info("No usable ffmpeg hwaccel found, using software H.264 decode")
+    return _hwaccel
+
+
+# ffmpeg -encoders のハードウェア MJPEG エンコーダ検出結果（プロセス内で一度だけ）
+_mjpeg_hw_checked = False
+_mjpeg_hw_encoder: Optional[str] = None
+# 実行時に init へ失敗したら以降はソフトウェアに固定する
+_mjpeg_hw_broken = False
+
+
+async def _detect_mjpeg_hw_encoder() -> Optional[str]:
+    """利用可能なハードウェア MJPEG エンコーダを検出する（結果はキャッシュ）。
+
+    デコード側の hwaccel と違い、エンコーダは init 失敗時に ffmpeg が自動で
+    ソフトウェアへフォールバックしないため、実行時に失敗したら
+    `_mjpeg_hw_broken` を立てて以降はソフトウェアエンコードを使う。
+    """
+    global _mjpeg_hw_checked, _mjpeg_hw_encoder
+    if _mjpeg_hw_checked:
+        return _mjpeg_hw_encoder
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-hide_banner",
+            "-encoders",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await proc.communicate()
+        text = stdout.decode()
+        if " mjpeg_qsv " in text:
+            _mjpeg_hw_encoder = "mjpeg_qsv"
+        elif " mjpeg_vaapi " in text and os.path.exists("/dev/dri/renderD128"):
+            _mjpeg_hw_encoder = "mjpeg_vaapi"
+    except Exception as e:
+        logger.warning(f"MJPEG hw encoder detection failed, using software: {e}")
+        _mjpeg_hw_encoder = None
+
+    _mjpeg_hw_checked = True
+    if _mjpeg_hw_encoder:
+        logger.info(f"Using hardware MJPEG encoder for captures: {_mjpeg_hw_encoder}")
+    return _mjpeg_hw_encoder
+
+
+@functools.lru_cache(maxsize=128)
 def _quality_percent_to_mjpeg_qscale(quality: int) -> int:
-    """Map a 1-100 quality percent to ffmpeg mjpeg qscale (2-31)."""
+    """Map a 1-100 quality percent to ffmpeg mjpeg qscale (2-31).
+
+    呼び出しはほぼ毎回同じ quality（デフォルト80）なのでキャッシュで
+    丸め計算ごと飛ばす。定義域は高々100値なので maxsize=128 で全て収まる。
+    """
 
     q = int(quality)
     if q < 1:
@@ -79,6 +314,51 @@ def _yuv420p_frame_size(width: int, height: int) -> int:
     return (width * height * 3) // 2
 
 
+def _scaled_dims(width: int, height: int, max_side: int) -> tuple[int, int]:
+    """長辺が max_side に収まるよう縮小した (width, height) を返す。
+
+    ffmpeg に渡す scale 式 trunc(iw*f/2)*2 と同じ演算（double 乗算 + 切り捨て +
+    偶数化）をなぞるので、デコーダ出力のフレームサイズと必ず一致する。
+    """
+    f = min(1.0, max_side / max(width, height))
+    if f >= 1.0:
+        return width, height
+    return int(width * f / 2) * 2, int(height * f / 2) * 2
+
+
+def _scale_vf_expr(max_side: int) -> str:
+    """長辺 max_side・アスペクト比維持・偶数サイズ保証の scale フィルタ式。"""
+    s = int(max_side)
+    return (
+        f"scale=trunc(iw*min(1\\,{s}/max(iw\\,ih))/2)*2"
+        f":trunc(ih*min(1\\,{s}/max(iw\\,ih))/2)*2"
+    )
+
+
+class _YuvSlabPool:
+    """固定サイズ YUV スラブの小さなプール。
+
+    30fps × 〜3MiB のフレームごとの bytes 確保（〜90MiB/s のアロケータ負荷）を、
+    事前確保したスラブの使い回しに置き換える。最新フレームしか保持しないため
+    数枚で足りる。キャプチャが参照中のスラブは呼び出し側が返却を遅らせる。
+    """
+
+    def __init__(self, size: int, count: int = 3) -> None:
+        self.size = size
+        self._free: deque[bytearray] = deque(bytearray(size) for _ in range(count))
+
+    def acquire(self) -> bytearray:
+        if self._free:
+            return self._free.popleft()
+        # 全スラブ貸出中（キャプチャが長引いた等、稀）。追加確保する。
+        return bytearray(self.size)
+
+    def release(self, slab: bytearray) -> None:
+        # 解像度変更で旧サイズのスラブが返ってきた場合は捨てる
+        if len(slab) == self.size and len(self._free) < 8:
+            self._free.append(slab)
+
+
 @dataclass(frozen=True)
 class CaptureResult:
     """Metadata for a single capture."""
@@ -97,8 +377,16 @@ class FrameBuffer:
     width: int
     height: int
     pix_fmt: str
-    captured_at: str
-    data: bytes
+    # time.time_ns() のエポックナノ秒。ISO 文字列化はキャプチャ時（稀）に行い、
+    # 30fps のデコードループからは tz 計算と isoformat() を排除する。
+    captured_ns: int
+    # プールスラブ上の読み取り専用ビュー。エンコーダ（turbojpeg / ffmpeg stdin）は
+    # いずれもバッファプロトコル経由で読むため bytes への包み直しは不要。
+    data: memoryview
+    # data が乗っているプールスラブ（プール管理外のフレームは None）
+    slab: Optional[bytearray] = None
+    # 公開時のシーケンス番号（JPEG キャッシュのキーに使う）。
+    seq: int = 0
 
 
 class CaptureWorker:
@@ -110,32 +398,64 @@ class CaptureWorker:
         output_dir: str,
         default_quality: int = 80,
         decoder_fps: int = 30,
+        max_side: int = 0,
     ) -> None:
         self.serial = serial
         self._stream_manager = stream_manager
         self._output_dir = Path(output_dir)
         self._default_quality = default_quality
         self._decoder_fps = decoder_fps
+        # 長辺の上限（0 = 縮小なし）。デコード時に libswscale で縮めることで
+        # 以降のパイプ転送・スラブ・JPEG エンコードの帯域を (max/native)^2 に落とす。
+        self._max_side = int(max_side)
 
         self._width: int | None = None
         self._height: int | None = None
-        self._last_sps: bytes | None = None  # SPS変更検出用
+        self._last_sps_crc: int | None = None  # SPS変更検出用（crc32 指紋）
         self._resolution_changed: bool = False  # 解像度変更フラグ
 
         self._refcount = 0
         self._ref_lock = asyncio.Lock()
 
         self._proc: Optional[asyncio.subprocess.Process] = None
+        # デコーダ stdout の読み出し fd（StreamReader を介さず readv でスラブへ直読みする）
+        self._stdout_fd: Optional[int] = None
         self._task_feed: Optional[asyncio.Task[None]] = None
         self._task_read: Optional[asyncio.Task[None]] = None
         self._task_stderr: Optional[asyncio.Task[None]] = None
 
+        self._pool: Optional[_YuvSlabPool] = None
+        # エンコード中のフレーム（_encode_sem で直列化されるため同時に1枚）。
+        # このフレームのスラブは読み取りループがプールへ返さない。
+        self._inuse_frame: Optional[FrameBuffer] = None
+
         self._seq = 0
         self._latest_frame: Optional[FrameBuffer] = None
-        self._cond = asyncio.Condition()
+        # 公開は single-latest-wins なので Condition ではなく Event + _seq で通知する。
+        # イベントループ上で await を挟まず publish するためロックは不要で、
+        # 誰も待っていないフレームでは set() が一度フラグを立てるだけで済む
+        # （notify_all() のタスクスケジューリングとロック再取得が消える）。
+        self._new_frame_event = asyncio.Event()
 
         self._encode_sem = asyncio.Semaphore(1)
 
+        # 保存 I/O をキャプチャ応答から切り離す背景ライタ（遅延起動）。
+        # キャプチャは JPEG エンコード完了で即返り、ディスク書き込みは
+        # このキューを介して裏で行う。
+        self._save_queue: Optional[asyncio.Queue[tuple[Path, bytes]]] = None
+        self._save_task: Optional[asyncio.Task[None]] = None
+
+        # 直近のエンコード結果 ((frame.seq, quality) -> jpeg)。同一フレーム期間に
+        # 複数クライアントが同品質でキャプチャした場合、2件目以降はエンコードを
+        # 丸ごとスキップできる。1エントリで十分（新フレームでキーが合わなくなる）。
+        self._jpeg_cache: Optional[tuple[tuple[int, int], bytes]] = None
+
+        # ffmpeg フォールバック用の常駐 MJPEG エンコーダ（遅延起動）。
+        # キャプチャごとの fork+init（50〜100ms）を払わないため、プロセスを
+        # 使い回す。解像度 / qscale が変わった時だけ再起動する。
+        self._mjpeg_proc: Optional[asyncio.subprocess.Process] = None
+        self._mjpeg_key: Optional[tuple[int, int, int]] = None
+
     @property
     def seq(self) -> int:
         return self._seq
@@ -163,13 +483,19 @@ class CaptureWorker:
         save: bool,
         wait_for_new_frame: bool = False,
         wait_timeout_sec: float = 5.0,
-    ) -> tuple[CaptureResult, bytes]:
-        """Return a JPEG image (bytes) and its metadata."""
-        import time
+    ) -> tuple[CaptureResult, memoryview]:
+        """Return a JPEG image (memoryview) and its metadata.
+
+        戻り値の JPEG はエンコーダ出力バッファ上の memoryview。JPEG は 100KB〜2MB
+        あるため、`bytes(...)` で包み直すフルコピーを送信パスから排除する。
+        """
         t0 = time.perf_counter()
 
         quality_percent = int(quality) if quality is not None else int(self._default_quality)
-        qscale = _quality_percent_to_mjpeg_qscale(quality_percent)
+        # turbojpeg は 1..100 の範囲外を ValueError にする（ffmpeg パスは qscale
+        # 変換が実質クランプする）。JSON の quality もバイナリプロトコルの
+        # 生バイト (0..255) もここで丸めて、どちらのエンコーダでも同じ挙動にする。
+        quality_percent = max(1, min(100, quality_percent))
 
         async with self._encode_sem:
             t1 = time.perf_counter()
@@ -178,7 +504,33 @@ class CaptureWorker:
                 wait_for_new_frame=wait_for_new_frame,
             )
             t2 = time.perf_counter()
-            jpeg = await self._encode_jpeg_with_ffmpeg(frame, qscale=qscale)
+            cache_key = (frame.seq, quality_percent)
+            cached = self._jpeg_cache
+            if cached is not None and cached[0] == cache_key:
+                # 同一フレーム・同一品質のキャプチャが直前に完了している
+                # （_encode_sem で直列化されるため、同時到着の2件目はここに来る）
+                jpeg = cached[1]
+            else:
+                # エンコード中は読み取りループがこのフレームのスラブを再利用しない
+                # ように参照を立てる（_encode_sem により同時に1枚のみ）。
+                self._inuse_frame = frame
+                try:
+                    if _turbo is not None:
+                        jpeg = await asyncio.to_thread(
+                            self._encode_jpeg_with_turbojpeg, frame, quality_percent
+                        )
+                    else:
+                        jpeg = await self._encode_jpeg_with_ffmpeg(frame, quality=quality_percent)
+                finally:
+                    self._inuse_frame = None
+                    # 既に最新でなくなっていたら、このフレームのスラブを返却する
+                    if (
+                        frame.slab is not None
+                        and frame is not self._latest_frame
+                        and self._pool is not None
+                    ):
+                        self._pool.release(frame.slab)
+                self._jpeg_cache = (cache_key, jpeg)
             t3 = time.perf_counter()
             logger.info(
                 f"Capture timing for {self.serial}: "
@@ -186,11 +538,13 @@ class CaptureWorker:
             )
 
             capture_id = str(uuid4())
-            captured_at = datetime.now(timezone.utc).isoformat()
+            # フレームがデコードされた時刻を ISO 化する（エンコード完了時刻ではなく）
+            captured_dt = datetime.fromtimestamp(frame.captured_ns / 1e9, tz=timezone.utc)
+            captured_at = captured_dt.isoformat()
 
             path: Optional[str] = None
             if save:
-                path = await self._save_jpeg(capture_id=capture_id, captured_at=captured_at, jpeg=jpeg)
+                path = self._save_jpeg(capture_id=capture_id, captured_dt=captured_dt, jpeg=jpeg)
 
             return (
                 CaptureResult(
@@ -202,21 +556,41 @@ class CaptureWorker:
                     bytes=len(jpeg),
                     path=path,
                 ),
-                jpeg,
+                memoryview(jpeg),
             )
 
-    async def _save_jpeg(self, *, capture_id: str, captured_at: str, jpeg: bytes) -> str:
-        out_dir = self._output_dir / self.serial
-        out_dir.mkdir(parents=True, exist_ok=True)
+    def _save_jpeg(self, *, capture_id: str, captured_dt: datetime, jpeg: bytes) -> str:
+        """保存先パスを確定して背景ライタに積む（ディスク I/O は待たない）。"""
+        # Use a filesystem-friendly timestamp (single strftime pass,
+        # no chained str.replace allocations)
+        ts = captured_dt.strftime("%Y%m%dT%H%M%S.%fZ")
+        file_path = self._output_dir / self.serial / f"{ts}_{capture_id}.jpg"
+
+        if self._save_queue is None:
+            self._save_queue = asyncio.Queue()
+            self._save_task = asyncio.create_task(
+                self._save_writer_loop(), name=f"capture-save-{self.serial}"
+            )
+        self._save_queue.put_nowait((file_path, jpeg))
 
-        # Use a filesystem-friendly timestamp
-        ts = captured_at.replace(":", "").replace("+", "").replace("Z", "")
-        file_path = out_dir / f"{ts}_{capture_id}.jpg"
+        return str(file_path)
 
-        # Avoid blocking event loop on file I/O.
-        await asyncio.to_thread(file_path.write_bytes, jpeg)
+    async def _save_writer_loop(self) -> None:
+        assert self._save_queue is not None
+        while True:
+            file_path, jpeg = await self._save_queue.get()
+            try:
+                # mkdir + write をまとめてスレッドへ（イベントループを塞がない）
+                await asyncio.to_thread(self._write_jpeg_file, file_path, jpeg)
+            except Exception as e:
+                logger.error(f"Failed to save capture to {file_path}: {e}")
+            finally:
+                self._save_queue.task_done()
 
-        return str(file_path)
+    @staticmethod
+    def _write_jpeg_file(file_path: Path, jpeg: bytes) -> None:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(jpeg)
 
     async def _get_latest_frame(self, *, timeout_sec: float, wait_for_new_frame: bool) -> FrameBuffer:
         """キャプチャリクエスト時に最新フレームを取得する。
@@ -229,90 +603,209 @@ class CaptureWorker:
             - 既にフレームがある場合でも「次のフレーム」を最大 timeout_sec 待つ。
             - タイムアウトしたら既存フレームを返す（フォールバック）。
         """
-        async with self._cond:
-            # 既存フレームを即返却（高速パス）
-            if self._latest_frame is not None and not wait_for_new_frame:
-                return self._latest_frame
+        # 既存フレームを即返却（高速パス）
+        if self._latest_frame is not None and not wait_for_new_frame:
+            return self._latest_frame
 
-            # 現在のシーケンス番号を記録
-            current_seq = self._seq
+        # 現在のシーケンス番号を記録
+        current_seq = self._seq
 
-            # まだフレームが無い場合は、まず1枚目が来るまで待つ
-            if self._latest_frame is None:
-                try:
-                    await asyncio.wait_for(
-                        self._cond.wait_for(lambda: self._latest_frame is not None),
-                        timeout=timeout_sec,
-                    )
-                except TimeoutError:
-                    raise TimeoutError("No frame available for capture")
-                assert self._latest_frame is not None
-                return self._latest_frame
-
-            # wait_for_new_frame=True: 新しいフレームが来るまで待つ（現在より大きいシーケンス番号）
+        # まだフレームが無い場合は、まず1枚目が来るまで待つ
+        if self._latest_frame is None:
             try:
                 await asyncio.wait_for(
-                    self._cond.wait_for(lambda: self._seq > current_seq and self._latest_frame is not None),
+                    self._wait_until(lambda: self._latest_frame is not None),
                     timeout=timeout_sec,
                 )
             except TimeoutError:
-                # タイムアウトした場合、既存フレームを使用（フォールバック）
-                logger.warning(
-                    f"Capture timeout waiting for new frame (seq={current_seq}), "
-                    f"using existing frame (seq={self._seq})"
-                )
-                assert self._latest_frame is not None
-                return self._latest_frame
-            
+                raise TimeoutError("No frame available for capture")
+            assert self._latest_frame is not None
+            return self._latest_frame
+
+        # wait_for_new_frame=True: 新しいフレームが来るまで待つ（現在より大きいシーケンス番号）
+        try:
+            await asyncio.wait_for(
+                self._wait_until(lambda: self._seq > current_seq and self._latest_frame is not None),
+                timeout=timeout_sec,
+            )
+        except TimeoutError:
+            # タイムアウトした場合、既存フレームを使用（フォールバック）
+            logger.warning(
+                f"Capture timeout waiting for new frame (seq={current_seq}), "
+                f"using existing frame (seq={self._seq})"
+            )
             assert self._latest_frame is not None
             return self._latest_frame
 
-    async def _encode_jpeg_with_ffmpeg(self, frame: FrameBuffer, *, qscale: int) -> bytes:
-        """Encode a single YUV420P frame to JPEG using ffmpeg (on-demand)."""
+        assert self._latest_frame is not None
+        return self._latest_frame
+
+    async def _wait_until(self, predicate) -> None:
+        """新フレーム Event を待ちながら predicate が真になるまでループする。
+
+        predicate 判定と clear() の間に await が無いため、publish との
+        取りこぼしは起きない（イベントループ上で割り込まれない）。
+        """
+        while not predicate():
+            self._new_frame_event.clear()
+            await self._new_frame_event.wait()
+
+    def _encode_jpeg_with_turbojpeg(self, frame: FrameBuffer, quality: int) -> bytes:
+        """Encode a single YUV420P frame to JPEG in-process with libjpeg-turbo.
+
+        SIMD (SSE2/AVX2/NEON) 実装のため ffmpeg サブプロセス経由より数倍速く、
+        フレームデータを色変換なしでそのまま渡せる。スレッドプールで実行すること
+        （C 側で GIL を解放するためイベントループをブロックしない）。
+        """
+        assert _turbo is not None
+        # ffmpeg の rawvideo yuv420p 出力は行パディングなしの詰め詰め配置。
+        # PyTurboJPEG のデフォルトは align=4（クロマ行が 4 バイト境界に
+        # パディングされる前提）なので、幅が 8 の倍数でないフレームでは
+        # 要求サイズがスラブ実サイズを超えて ValueError になる。align=1 を明示する。
+        return _turbo.encode_from_yuv(
+            frame.data,
+            frame.height,
+            frame.width,
+            quality=quality,
+            jpeg_subsample=TJSAMP_420,
+            align=1,
+        )
+
+    async def _encode_jpeg_with_ffmpeg(self, frame: FrameBuffer, *, quality: int) -> bytes:
+        """Encode a single YUV420P frame to JPEG using a persistent ffmpeg encoder.
+
+        以前はキャプチャごとに ffmpeg を fork しており、fork + init の 50〜100ms が
+        エンコード自体（数ms）を圧倒していた。常駐プロセスに rawvideo フレームを
+        流し込み、連結 MJPEG 出力から SOI..EOI で1枚を切り出す。
+        エンコードは _encode_sem で直列化されているため 1 in / 1 out で対応が取れる。
+        mjpeg_qsv / mjpeg_vaapi が使えるホストではそちらにオフロードし、
+        実行時に失敗したらソフトウェアで即リトライする。
+        """
+        global _mjpeg_hw_broken
+
+        encoder = None if _mjpeg_hw_broken else await _detect_mjpeg_hw_encoder()
+        try:
+            proc = await self._ensure_mjpeg_encoder(frame.width, frame.height, quality, encoder)
+            assert proc.stdin is not None
+            assert proc.stdout is not None
+            proc.stdin.write(frame.data)
+            await proc.stdin.drain()
+            jpeg = await self._read_one_jpeg(proc.stdout)
+        except Exception:
+            # エンコーダが壊れた可能性があるので捨てる（次回キャプチャで再起動）
+            await self._stop_mjpeg_encoder()
+            if encoder is not None and not _mjpeg_hw_broken:
+                logger.warning(
+                    f"Hardware MJPEG encoder {encoder} failed for {self.serial}, falling back to software"
+                )
+                _mjpeg_hw_broken = True
+                return await self._encode_jpeg_with_ffmpeg(frame, quality=quality)
+            raise
+
+        if not jpeg.startswith(b"\xff\xd8"):
+            await self._stop_mjpeg_encoder()
+            raise RuntimeError("Failed to encode JPEG")
+        return jpeg
+
+    async def _ensure_mjpeg_encoder(
+        self, width: int, height: int, quality: int, encoder: Optional[str]
+    ) -> asyncio.subprocess.Process:
+        key = (width, height, quality, encoder)
+        proc = self._mjpeg_proc
+        if proc is not None and self._mjpeg_key == key and proc.returncode is None:
+            return proc
+
+        await self._stop_mjpeg_encoder()
+
+        # ハードウェアエンコーダは JPEG 流の 1-100 quality（global_quality）、
+        # ソフトウェア mjpeg は qscale (2-31) を取る
+        if encoder == "mjpeg_qsv":
+            device_args: list[str] = []
+            output_args = ["-c:v", "mjpeg_qsv", "-global_quality", str(quality)]
+        elif encoder == "mjpeg_vaapi":
+            device_args = ["-vaapi_device", "/dev/dri/renderD128"]
+            output_args = [
+                "-vf",
+                "format=nv12,hwupload",
+                "-c:v",
+                "mjpeg_vaapi",
+                "-global_quality",
+                str(quality),
+            ]
+        else:
+            device_args = []
+            output_args = ["-c:v", "mjpeg", "-q:v", str(_quality_percent_to_mjpeg_qscale(quality))]
 
         args = [
             "ffmpeg",
             "-loglevel",
             "error",
             "-nostdin",
+            *device_args,
             "-f",
             "rawvideo",
             "-pix_fmt",
-            frame.pix_fmt,
+            "yuv420p",
             "-s",
-            f"{frame.width}x{frame.height}",
+            f"{width}x{height}",
             "-i",
             "pipe:0",
-            "-frames:v",
-            "1",
             "-f",
-            "mjpeg",
-            "-q:v",
-            str(qscale),
+            "image2pipe",
+            *output_args,
+            "-flush_packets",
+            "1",
             "pipe:1",
         ]
-
         proc = await asyncio.create_subprocess_exec(
             *args,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
+        self._mjpeg_proc = proc
+        self._mjpeg_key = key
+        logger.info(
+            f"Started persistent MJPEG encoder for {self.serial}: {width}x{height} q={quality} encoder={encoder or 'mjpeg'}"
+        )
+        return proc
 
-        assert proc.stdin is not None
-        assert proc.stdout is not None
-
-        proc.stdin.write(frame.data)
-        await proc.stdin.drain()
-        proc.stdin.close()
+    async def _stop_mjpeg_encoder(self) -> None:
+        proc = self._mjpeg_proc
+        if proc is None:
+            return
+        self._mjpeg_proc = None
+        self._mjpeg_key = None
 
-        jpeg = await proc.stdout.read()
         with contextlib.suppress(Exception):
-            await proc.wait()
+            if proc.stdin:
+                proc.stdin.close()
+        with contextlib.suppress(Exception):
+            proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=1.0)
+        except Exception:
+            with contextlib.suppress(Exception):
+                proc.kill()
 
-        if not jpeg.startswith(b"\xff\xd8"):
-            raise RuntimeError("Failed to encode JPEG")
-        return jpeg
+    @staticmethod
+    async def _read_one_jpeg(stdout: asyncio.StreamReader) -> bytes:
+        """連結 MJPEG 出力から1枚分 (SOI..EOI) を読み出す。
+
+        エントロピー符号中の 0xFF は 0x00 でスタッフィングされるため、
+        FFD9 は EOI マーカーとしてのみ現れる。
+        """
+        buf = bytearray()
+        while True:
+            chunk = await stdout.read(256 * 1024)
+            if not chunk:
+                raise RuntimeError("MJPEG encoder closed unexpectedly")
+            # マーカーがチャンク境界で割れる場合に備えて 1 バイト重ねて探す
+            search_from = max(0, len(buf) - 1)
+            buf.extend(chunk)
+            end = buf.find(b"\xff\xd9", search_from)
+            if end >= 0:
+                return bytes(buf[: end + 2])
 
     async def _start_decoder(self) -> None:
         if self._proc is not None:
@@ -320,6 +813,8 @@ class CaptureWorker:
 
         logger.info(f"Starting capture decoder for {self.serial}")
 
+        hwaccel = await _detect_hwaccel()
+
         # NOTE: ffmpeg must be installed in the runtime environment.
         # We decode continuously to rawvideo (yuv420p) and keep only the latest frame.
         # NOTE: fps フィルタは削除。入力フレームレートをそのまま使用し、遅延を最小化する。
@@ -339,6 +834,14 @@ class CaptureWorker:
             "32",
             "-analyzeduration",
             "0",
+            # 1 デバイス 1 ストリームは単一スレッドで余裕があり、マルチデバイス時に
+            # 各 ffmpeg がデフォルトのスレッドプールでコアを奪い合うのを防ぐ
+            # （フレームスレッド分のレイテンシも消える）。
+            "-threads",
+            "1",
+            # ハードウェアデコード（利用可能な場合のみ。init 失敗時は ffmpeg が
+            # ソフトウェアデコードにフォールバックする）
+            *(["-hwaccel", hwaccel] if hwaccel else []),
             "-f",
             "h264",
             "-i",
@@ -346,6 +849,7 @@ class CaptureWorker:
             # 出力オプション: フレームを即座に出力
             "-vsync",
             "passthrough",
+            *(["-vf", _scale_vf_expr(self._max_side)] if self._max_side else []),
             "-pix_fmt",
             "yuv420p",
             "-f",
@@ -355,17 +859,44 @@ class CaptureWorker:
             "pipe:1",
         ]
 
-        self._proc = await asyncio.create_subprocess_exec(
-            *args,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        self._proc = await self._spawn_decoder(args)
 
         self._task_feed = asyncio.create_task(self._feed_h264_loop(), name=f"capture-feed-{self.serial}")
         self._task_read = asyncio.create_task(self._read_rawvideo_loop(), name=f"capture-read-{self.serial}")
         self._task_stderr = asyncio.create_task(self._read_ffmpeg_stderr_loop(), name=f"capture-stderr-{self.serial}")
 
+    async def _spawn_decoder(self, args: list[str]) -> asyncio.subprocess.Process:
+        """デコーダプロセスを起動する。
+
+        stdout は asyncio の StreamReader（64KiB バッファの成長コピーが
+        フレームごとに走る）ではなく生の pipe fd で受け、読み取りループが
+        os.readv でプール済みスラブへ直接読み込む。
+        """
+        r_fd, w_fd = os.pipe()
+        # バッファサイズは pipe 自体の属性なのでどちらの fd から設定してもよい
+        _grow_pipe(r_fd)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=w_fd,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except Exception:
+            os.close(r_fd)
+            raise
+        finally:
+            os.close(w_fd)
+
+        # H.264 入力側もキーフレームのバーストで 64KiB を超えるので同様に広げる
+        if proc.stdin is not None:
+            pipe = proc.stdin.transport.get_extra_info("pipe")
+            if pipe is not None:
+                _grow_pipe(pipe.fileno())
+
+        self._stdout_fd = r_fd
+        return proc
+
     async def _stop_decoder(self) -> None:
         if self._proc is None:
             return
@@ -392,6 +923,26 @@ class CaptureWorker:
         self._task_read = None
         self._task_stderr = None
 
+        # 読み取りタスクが一度も走らずキャンセルされた場合の fd 後始末
+        # （走っていれば fd の所有権はタスク側に移っており、タスクが閉じる）
+        if self._stdout_fd is not None:
+            with contextlib.suppress(OSError):
+                os.close(self._stdout_fd)
+            self._stdout_fd = None
+
+        await self._stop_mjpeg_encoder()
+
+        # 積まれた保存をフラッシュしてから背景ライタを畳む
+        if self._save_task is not None:
+            if self._save_queue is not None and not self._save_queue.empty():
+                with contextlib.suppress(Exception):
+                    await asyncio.wait_for(self._save_queue.join(), timeout=5.0)
+            self._save_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._save_task
+            self._save_task = None
+            self._save_queue = None
+
     async def _restart_decoder_for_resolution_change(self, first_chunk: bytes) -> None:
         """解像度変更時にffmpegデコーダを再起動する。"""
         logger.info(f"Restarting decoder for resolution change: {self.serial}")
@@ -437,6 +988,7 @@ class CaptureWorker:
 
     async def _start_decoder_process_only(self) -> None:
         """ffmpegプロセスのみを起動する（タスクは別途開始）。"""
+        hwaccel = await _detect_hwaccel()
         args = [
             "ffmpeg",
             "-hide_banner",
@@ -444,10 +996,14 @@ class CaptureWorker:
             "info",
             "-nostats",
             "-nostdin",
+            "-threads",
+            "1",
+            *(["-hwaccel", hwaccel] if hwaccel else []),
             "-f",
             "h264",
             "-i",
             "pipe:0",
+            *(["-vf", _scale_vf_expr(self._max_side)] if self._max_side else []),
             "-f",
             "rawvideo",
             "-pix_fmt",
@@ -457,12 +1013,7 @@ class CaptureWorker:
 
         logger.info(f"Starting decoder process for {self.serial}: {' '.join(args)}")
 
-        self._proc = await asyncio.create_subprocess_exec(
-            *args,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        self._proc = await self._spawn_decoder(args)
 
         # 読み取りタスクを開始
         self._task_read = asyncio.create_task(self._read_rawvideo_loop(), name=f"capture-read-{self.serial}")
@@ -488,17 +1039,29 @@ class CaptureWorker:
                     if not chunk or self._proc is None:
                         break
                     
-                    # SPS変更を検出（解像度変更の検出）
-                    sps = _find_sps_nal_unit(chunk)
-                    if sps is not None:
-                        if self._last_sps is None:
+                    # SPS変更を検出（解像度変更の検出）。
+                    # SPS は IDR 周辺にしか現れないため、まず先頭 NAL type だけを
+                    # 見て対象外チャンク（非キーフレーム、〜98%）の走査を丸ごと省く。
+                    # subscribe() は NAL 単位で yield するので先頭 type の判定で足りるが、
+                    # IDR/PPS（SPS が隣接し得る型）も念のため走査対象に残す。
+                    sps_bounds = None
+                    sc = chunk.find(b"\x00\x00\x01")
+                    if sc >= 0 and sc + 3 < len(chunk) and (chunk[sc + 3] & 0x1F) in (5, 7, 8):
+                        sps_bounds = _find_sps_bounds(chunk)
+                    if sps_bounds is not None:
+                        sps_crc = zlib.crc32(memoryview(chunk)[sps_bounds[0] : sps_bounds[1]])
+                        if self._last_sps_crc is None:
                             logger.info(f"Capture feed {self.serial}: initial SPS detected")
-                            self._last_sps = sps
-                        elif sps != self._last_sps:
+                            self._last_sps_crc = sps_crc
+                            # stderr の "Video: WxH" を待たず SPS から解像度を確定させ、
+                            # 読み取りループを即座に解放する
+                            self._apply_sps_dimensions(chunk, sps_bounds)
+                        elif sps_crc != self._last_sps_crc:
                             logger.info(f"Capture feed {self.serial}: SPS changed (resolution change), restarting decoder")
-                            self._last_sps = sps
+                            self._last_sps_crc = sps_crc
                             # ffmpegプロセスを再起動
                             await self._restart_decoder_for_resolution_change(chunk)
+                            self._apply_sps_dimensions(chunk, sps_bounds)
                             continue
                     
                     try:
@@ -532,6 +1095,22 @@ class CaptureWorker:
 
         logger.info(f"Capture feed loop ended for {self.serial}: {chunk_count} chunks, {total_bytes} bytes")
 
+    def _apply_sps_dimensions(self, chunk: bytes, bounds: tuple[int, int]) -> None:
+        """SPS から解像度を直接取り、未確定なら設定する。
+
+        解析できなければ何もしない（従来どおり stderr の解析が設定する）。
+        """
+        if self._width is not None:
+            return
+        dims = _parse_sps_dimensions(chunk[bounds[0] + 1 : bounds[1]])
+        if dims is None:
+            return
+        # _width/_height はデコーダ「出力」の寸法（縮小後）を保持する
+        if self._max_side:
+            dims = _scaled_dims(dims[0], dims[1], self._max_side)
+        self._width, self._height = dims
+        logger.info(f"Capture decoder resolution for {self.serial} from SPS: {dims[0]}x{dims[1]}")
+
     async def _read_ffmpeg_stderr_loop(self) -> None:
         assert self._proc is not None
         assert self._proc.stderr is not None
@@ -542,13 +1121,17 @@ class CaptureWorker:
                 if not line:
                     break
 
+                # 共通ケース（"Video:" を含まない行）は bytes のまま振り分けて
+                # decode と debug 用 f-string 構築を丸ごと飛ばす
+                if b"Video:" not in line:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"ffmpeg stderr [{self.serial}]: {line.decode('utf-8', errors='ignore').rstrip()}")
+                    continue
+
                 text = line.decode("utf-8", errors="ignore").rstrip()
-                # Log all ffmpeg stderr for debugging
                 logger.debug(f"ffmpeg stderr [{self.serial}]: {text}")
-                
+
                 # Detect resolution changes (not just initial detection)
-                if "Video:" not in text:
-                    continue
                 m = _RE_DIM.search(text)
                 if not m:
                     continue
@@ -557,6 +1140,10 @@ class CaptureWorker:
                 h = int(m.group("h"))
                 if w <= 0 or h <= 0:
                     continue
+                # stderr の "Video:" は入力ストリームの寸法。縮小時は
+                # デコーダ出力（＝読み取りループが組むフレーム）の寸法に換算する
+                if self._max_side:
+                    w, h = _scaled_dims(w, h, self._max_side)
 
                 if self._width != w or self._height != h:
                     old_w, old_h = self._width, self._height
@@ -573,85 +1160,153 @@ class CaptureWorker:
 
     async def _read_rawvideo_loop(self) -> None:
         assert self._proc is not None
-        assert self._proc.stdout is not None
+        # fd の所有権をタスク側に移す（終了時にここで閉じる）
+        fd = self._stdout_fd
+        self._stdout_fd = None
+        if fd is None:
+            return
 
-        buf = bytearray()
-        read_count = 0
-        total_bytes = 0
+        loop = asyncio.get_running_loop()
+        os.set_blocking(fd, False)
+        data_ready = asyncio.Event()
+        loop.add_reader(fd, data_ready.set)
+
+        # プールはこのループの生存期間に紐づく（再起動時に旧プールを引き継がない）
+        self._pool = None
+
+        # 解像度判明前（stderr 解析が追いつくまで）に届いたデータの一時バッファ。
+        preroll = bytearray()
+        slab: Optional[bytearray] = None
+        filled = 0
+        frame_size = 0
         frame_count = 0
+        skipped_count = 0
+        # pipe を飲み干すまでに完成した最後のフレーム（この1枚だけを公開する）。
+        # イベントループが遅れて複数フレーム分が溜まった場合、中間フレームは
+        # FrameBuffer 化も公開もせずスラブごと捨てる — 使われるのは常に最新のみ。
+        pending: Optional[bytearray] = None
+        pending_ns = 0
         last_width: int | None = None
         last_height: int | None = None
+        eof = False
 
         logger.info(f"Capture rawvideo loop started for {self.serial}")
 
         try:
-            while True:
-                chunk = await self._proc.stdout.read(256 * 1024)
-                if not chunk:
-                    logger.warning(f"Capture rawvideo loop {self.serial}: EOF after {read_count} reads, {total_bytes} bytes")
-                    break
-
-                read_count += 1
-                total_bytes += len(chunk)
-                buf.extend(chunk)
-
-                # 高頻度ログは DEBUG に下げ、頻度も 1000 回ごとに削減（遅延原因になるため）
-                if read_count <= 3:
-                    logger.info(f"Capture rawvideo {self.serial}: read #{read_count}, chunk={len(chunk)}, total={total_bytes}, buf={len(buf)}, w={self._width}, h={self._height}")
-                elif read_count % 1000 == 0:
-                    logger.debug(f"Capture rawvideo {self.serial}: read #{read_count}, chunk={len(chunk)}, total={total_bytes}, buf={len(buf)}, w={self._width}, h={self._height}")
-
-                if self._width is None or self._height is None:
-                    continue
-                
-                # 解像度変更時にバッファをクリア
-                if self._resolution_changed:
-                    logger.info(f"Capture rawvideo {self.serial}: resolution changed flag set, clearing buffer ({len(buf)} bytes)")
-                    buf.clear()
-                    self._resolution_changed = False
-                elif last_width is not None and last_height is not None:
-                    if self._width != last_width or self._height != last_height:
-                        logger.info(f"Capture rawvideo {self.serial}: resolution changed, clearing buffer ({len(buf)} bytes)")
-                        buf.clear()
-                        
-                last_width = self._width
-                last_height = self._height
-                
-                frame_size = _yuv420p_frame_size(self._width, self._height)
-                if frame_size <= 0:
-                    continue
-
-                # Consume complete frames; keep only latest.
-                latest: bytes | None = None
-                while len(buf) >= frame_size:
-                    latest = bytes(buf[:frame_size])
-                    del buf[:frame_size]
+            while not eof:
+                await data_ready.wait()
+                data_ready.clear()
+
+                # EAGAIN になるまで読む
+                while True:
+                    if self._width is None or self._height is None:
+                        try:
+                            chunk = os.read(fd, 256 * 1024)
+                        except BlockingIOError:
+                            break
+                        if not chunk:
+                            logger.warning(f"Capture rawvideo loop {self.serial}: EOF before resolution known")
+                            eof = True
+                            break
+                        preroll.extend(chunk)
+                        continue
+
+                    # 解像度変更時に溜まったデータとスラブをリセット
+                    if self._resolution_changed or (
+                        last_width is not None
+                        and (self._width != last_width or self._height != last_height)
+                    ):
+                        logger.info(f"Capture rawvideo {self.serial}: resolution changed, resetting buffers")
+                        self._resolution_changed = False
+                        preroll.clear()
+                        self._pool = None
+                        slab = None
+                        filled = 0
+                        pending = None
+
+                    last_width = self._width
+                    last_height = self._height
+
+                    if self._pool is None:
+                        frame_size = _yuv420p_frame_size(self._width, self._height)
+                        self._pool = _YuvSlabPool(frame_size)
+                        slab = self._pool.acquire()
+                        filled = 0
+                    assert slab is not None
+
+                    if preroll:
+                        # 解像度判明前に届いた分を先にスラブへ流し込む
+                        take = min(len(preroll), frame_size - filled)
+                        slab[filled : filled + take] = preroll[:take]
+                        del preroll[:take]
+                        filled += take
+                    else:
+                        # pipe からプール済みスラブへ直接読む（中間 bytes なし）
+                        try:
+                            n = os.readv(fd, [memoryview(slab)[filled:]])
+                        except BlockingIOError:
+                            break
+                        if n == 0:
+                            logger.warning(f"Capture rawvideo loop {self.serial}: EOF after {frame_count} frames")
+                            eof = True
+                            break
+                        filled += n
+
+                    if filled < frame_size:
+                        continue
+
+                    # フレーム確定。即公開せず pending に積み、pipe が空になるまで
+                    # 次のフレームを読み続ける（溜まっていた中間フレームをスキップ）。
                     frame_count += 1
+                    if pending is not None:
+                        skipped_count += 1
+                        self._pool.release(pending)
+                    pending = slab
+                    pending_ns = time.time_ns()
+                    slab = self._pool.acquire()
+                    filled = 0
+
+                    if frame_count % 30 == 1:
+                        logger.debug(
+                            f"Capture rawvideo {self.serial}: frame {frame_count} "
+                            f"({skipped_count} skipped under backpressure)"
+                        )
+
+                # pipe を飲み干した時点の最後の完成フレームだけを公開する。
+                # 追い出された旧フレームのスラブは、キャプチャが参照中で
+                # なければプールへ返す。
+                if pending is not None and self._pool is not None:
+                    fb = FrameBuffer(
+                        width=self._width,
+                        height=self._height,
+                        pix_fmt="yuv420p",
+                        captured_ns=pending_ns,
+                        seq=self._seq + 1,
+                        data=memoryview(pending).toreadonly(),
+                        slab=pending,
+                    )
+                    pending = None
 
-                if latest is None:
-                    continue
-
-                fb = FrameBuffer(
-                    width=self._width,
-                    height=self._height,
-                    pix_fmt="yuv420p",
-                    captured_at=datetime.now(timezone.utc).isoformat(),
-                    data=latest,
-                )
-
-                async with self._cond:
+                    displaced = self._latest_frame
                     self._latest_frame = fb
-                    self._seq += 1
-                    self._cond.notify_all()
-                
-                if frame_count % 30 == 1:
-                    logger.debug(f"Capture rawvideo {self.serial}: frame {frame_count} updated")
+                    self._seq = fb.seq
+                    self._new_frame_event.set()
+
+                    if (
+                        displaced is not None
+                        and displaced.slab is not None
+                        and displaced is not self._inuse_frame
+                    ):
+                        self._pool.release(displaced.slab)
 
         except asyncio.CancelledError:
             raise
         except Exception as e:
             logger.error(f"Capture rawvideo loop error for {self.serial}: {e}")
         finally:
+            loop.remove_reader(fd)
+            with contextlib.suppress(OSError):
+                os.close(fd)
             logger.info(f"Capture rawvideo loop ended for {self.serial}: {frame_count} frames")
 
 
@@ -664,26 +1319,31 @@ class CaptureManager:
         stream_manager: "StreamManager",
         output_dir: str,
         default_quality: int = 80,
+        max_side: int = 0,
     ) -> None:
         self._stream_manager = stream_manager
         self._output_dir = output_dir
         self._default_quality = int(default_quality)
+        self._max_side = int(max_side)
 
+        # _workers の操作はすべて await を挟まない同期区間で行うため、
+        # イベントループ上でアトミックでありロック不要。直列化が必要なのは
+        # デコーダ起動/停止で、それは各 worker の _ref_lock（serial 単位）が担う。
+        # 以前の単一 Lock は全 serial の WS ハンドシェイクを無意味に直列化していた。
         self._workers: dict[str, CaptureWorker] = {}
-        self._lock = asyncio.Lock()
 
     async def get_or_create_worker(self, serial: str) -> CaptureWorker:
-        async with self._lock:
-            worker = self._workers.get(serial)
-            if worker is None:
-                worker = CaptureWorker(
-                    serial,
-                    stream_manager=self._stream_manager,
-                    output_dir=self._output_dir,
-                    default_quality=self._default_quality,
-                )
-                self._workers[serial] = worker
-            return worker
+        worker = self._workers.get(serial)
+        if worker is None:
+            worker = CaptureWorker(
+                serial,
+                stream_manager=self._stream_manager,
+                output_dir=self._output_dir,
+                default_quality=self._default_quality,
+                max_side=self._max_side,
+            )
+            self._workers[serial] = worker
+        return worker
 
     async def acquire(self, serial: str) -> CaptureWorker:
         worker = await self.get_or_create_worker(serial)
@@ -691,9 +1351,7 @@ class CaptureManager:
         return worker
 
     async def release(self, serial: str) -> None:
-        async with self._lock:
-            worker = self._workers.get(serial)
-
+        worker = self._workers.get(serial)
         if worker is None:
             return
 
@@ -701,14 +1359,12 @@ class CaptureManager:
 
         # If it's fully released, drop it from registry.
         if worker.refcount == 0:
-            async with self._lock:
-                if self._workers.get(serial) is worker and worker.refcount == 0:
-                    self._workers.pop(serial, None)
+            if self._workers.get(serial) is worker and worker.refcount == 0:
+                self._workers.pop(serial, None)
 
     async def stop_all(self) -> None:
-        async with self._lock:
-            workers = list(self._workers.values())
-            self._workers.clear()
+        workers = list(self._workers.values())
+        self._workers.clear()
 
         for worker in workers:
             with contextlib.suppress(Exception):
@@ -719,13 +1375,7 @@ class CaptureManager:
     async def snapshot_running(self) -> dict[str, bool]:
         """Return a mapping of serial -> capture decoder running."""
 
-        async with self._lock:
-            workers = dict(self._workers)
-
-        result: dict[str, bool] = {}
-        for serial, worker in workers.items():
-            result[serial] = bool(worker.refcount > 0)
-        return result
+        return {serial: worker.refcount > 0 for serial, worker in self._workers.items()}
 
 
 _capture_manager: Optional[CaptureManager] = None
@@ -736,6 +1386,7 @@ def get_capture_manager(
     stream_manager: "StreamManager",
     output_dir: str,
     default_quality: int = 80,
+    max_side: int = 0,
 ) -> CaptureManager:
     """CaptureManager のシングルトンインスタンスを取得"""
 
@@ -745,5 +1396,6 @@ def get_capture_manager(
             stream_manager=stream_manager,
             output_dir=output_dir,
             default_quality=default_quality,
+            max_side=max_side,
         )
     return _capture_manager
@@ -6,6 +6,8 @@ import asyncio
 import logging
 from typing import Callable, Optional
 
+import orjson
+
 from app.models.device import DeviceInfo, DeviceState
 from app.services.device_monitor import DeviceMonitor
 from app.services.device_registry import DeviceRegistry
@@ -26,9 +28,14 @@ class DeviceManager:
 
         self._change_callbacks: list[Callable[[], None]] = []
 
-        self.monitor.on_device_connected(self._handle_connected)
-        self.monitor.on_device_disconnected(self._handle_disconnected)
-        self.monitor.on_state_changed(self._handle_state_changed)
+        # デバイス一覧のシリアライズ済みJSONキャッシュ。
+        # デバイス変更は稀なので、リクエストごとの O(N) シリアライズを
+        # O(1) の memcpy に置き換える。変更通知時に無効化する。
+        self._cached_list_json: Optional[bytes] = None
+
+        self.monitor.on_devices_changed(self._handle_devices_changed)
+        # model/manufacturer の遅延取得完了時もキャッシュを無効化して変更を通知する
+        self.registry.on_details_updated(self._notify_change)
 
     def on_change(self, callback: Callable[[], None]) -> None:
         """デバイス一覧に変更があった時のコールバックを登録"""
@@ -52,32 +59,45 @@ class DeviceManager:
         """全デバイス一覧を取得"""
         return await self.registry.list_all()
 
+    async def list_devices_json(self) -> bytes:
+        """全デバイス一覧のシリアライズ済みJSON（キャッシュ）を取得"""
+        cached = self._cached_list_json
+        if cached is None:
+            devices = await self.registry.list_all()
+            cached = orjson.dumps([d.to_dict() for d in devices])
+            self._cached_list_json = cached
+        return cached
+
     async def list_online_devices(self) -> list[DeviceInfo]:
         """オンラインデバイス一覧を取得"""
         return await self.registry.list_online()
 
-    def _handle_connected(self, serial: str, state: DeviceState) -> None:
-        asyncio.create_task(self._async_handle_connected(serial, state))
-
-    async def _async_handle_connected(self, serial: str, state: DeviceState) -> None:
-        await self.registry.register(serial, state)
-        self._notify_change()
-
-    def _handle_disconnected(self, serial: str) -> None:
-        asyncio.create_task(self._async_handle_disconnected(serial))
-
-    async def _async_handle_disconnected(self, serial: str) -> None:
-        await self.registry.unregister(serial)
-        self._notify_change()
-
-    def _handle_state_changed(self, serial: str, state: DeviceState) -> None:
-        asyncio.create_task(self._async_handle_state_changed(serial, state))
-
-    async def _async_handle_state_changed(self, serial: str, state: DeviceState) -> None:
-        await self.registry.update_state(serial, state)
+    def _handle_devices_changed(
+        self,
+        connected: list[tuple[str, DeviceState]],
+        disconnected: list[str],
+        changed: list[tuple[str, DeviceState]],
+    ) -> None:
+        # diff 1 回分の変更をタスク 1 つでまとめて registry に適用し、
+        # 変更通知も 1 回だけ発火する（serial ごとにタスクを作らない）。
+        asyncio.create_task(self._async_apply_changes(connected, disconnected, changed))
+
+    async def _async_apply_changes(
+        self,
+        connected: list[tuple[str, DeviceState]],
+        disconnected: list[str],
+        changed: list[tuple[str, DeviceState]],
+    ) -> None:
+        for serial, state in connected:
+            await self.registry.register(serial, state)
+        for serial in disconnected:
+            await self.registry.unregister(serial)
+        for serial, state in changed:
+            await self.registry.update_state(serial, state)
         self._notify_change()
 
     def _notify_change(self) -> None:
+        self._cached_list_json = None
         for callback in self._change_callbacks:
             try:
                 callback()
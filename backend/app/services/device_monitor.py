@@ -10,6 +10,15 @@ from app.models.device import DeviceState
 
 logger = logging.getLogger(__name__)
 
+# adb が返す state 文字列 → DeviceState。呼び出しごとに dict を作り直さない
+# ようモジュールレベルに一度だけ構築する。
+_STATE_MAP = {
+    "device": DeviceState.DEVICE,
+    "offline": DeviceState.OFFLINE,
+    "unauthorized": DeviceState.UNAUTHORIZED,
+    "connecting": DeviceState.CONNECTING,
+}
+
 
 class DeviceMonitor:
     """adb track-devices を購読し、デバイス変更イベントを発行"""
@@ -19,20 +28,21 @@ class DeviceMonitor:
         self._running = False
         self._task: Optional[asyncio.Task] = None
 
-        self._on_connected: list[Callable[[str, DeviceState], None]] = []
-        self._on_disconnected: list[Callable[[str], None]] = []
-        self._on_state_changed: list[Callable[[str, DeviceState], None]] = []
+        # 1 回の diff で検出した全変更（接続 / 切断 / state 変化）をまとめて
+        # 1 コールバックで通知する。serial ごとに発火すると、20 台同時再接続の
+        # ような場面で受け側が 20 個のタスクを作ることになるため。
+        self._on_batch_change: list[
+            Callable[[list[tuple[str, DeviceState]], list[str], list[tuple[str, DeviceState]]], None]
+        ] = []
 
         self._current_devices: dict[str, DeviceState] = {}
 
-    def on_device_connected(self, callback: Callable[[str, DeviceState], None]) -> None:
-        self._on_connected.append(callback)
-
-    def on_device_disconnected(self, callback: Callable[[str], None]) -> None:
-        self._on_disconnected.append(callback)
-
-    def on_state_changed(self, callback: Callable[[str, DeviceState], None]) -> None:
-        self._on_state_changed.append(callback)
+    def on_devices_changed(
+        self,
+        callback: Callable[[list[tuple[str, DeviceState]], list[str], list[tuple[str, DeviceState]]], None],
+    ) -> None:
+        """diff 1 回分の変更 (connected, disconnected, changed) を受けるコールバックを登録"""
+        self._on_batch_change.append(callback)
 
     async def start(self) -> None:
         if self._running:
@@ -86,26 +96,36 @@ class DeviceMonitor:
         logger.info("Started adb track-devices")
 
         try:
+            # read(4) + read(length) のペアは 1 メッセージにつき await が 2 回必要な上、
+            # StreamReader.read(n) は n 未満で返ることがある（short read）。
+            # 持ち越しバッファに read で取れた分を溜め、揃っている
+            # <hex4><payload> フレームをまとめて取り出す方式にすると
+            # メッセージあたり await ≤1 回になり short read にも正しく対応できる。
+            buf = bytearray()
             while self._running and self._process.stdout:
-                length_hex = await self._process.stdout.read(4)
-                if not length_hex:
+                chunk = await self._process.stdout.read(8192)
+                if not chunk:
                     break
+                buf += chunk
 
-                try:
-                    length = int(length_hex.decode(), 16)
-                except ValueError:
-                    logger.error(f"Invalid length prefix: {length_hex}")
-                    continue
+                offset = 0
+                while len(buf) - offset >= 4:
+                    try:
+                        length = int(buf[offset : offset + 4], 16)
+                    except ValueError:
+                        logger.error(f"Invalid length prefix: {bytes(buf[offset:offset + 4])!r}")
+                        offset += 4
+                        continue
 
-                if length == 0:
-                    await self._process_device_list("")
-                    continue
+                    if len(buf) - offset - 4 < length:
+                        break  # ペイロードが揃うまで次の read を待つ
 
-                data = await self._process.stdout.read(length)
-                if not data:
-                    break
+                    payload = buf[offset + 4 : offset + 4 + length]
+                    offset += 4 + length
+                    await self._process_device_list(payload.decode().strip() if length else "")
 
-                await self._process_device_list(data.decode().strip())
+                if offset:
+                    del buf[:offset]
 
         finally:
             if self._process:
@@ -115,59 +135,52 @@ class DeviceMonitor:
     async def _process_device_list(self, data: str) -> None:
         new_devices: dict[str, DeviceState] = {}
 
-        for line in data.split("\n"):
+        for line in data.splitlines():
             line = line.strip()
             if not line:
                 continue
 
-            parts = line.split("\t")
-            if len(parts) >= 2:
-                serial = parts[0]
-                state_str = parts[1]
-                state = self._parse_state(state_str)
-                new_devices[serial] = state
+            # 行は "serial\tstate" 形式。2 フィールドしか使わないので
+            # split のリスト生成を避けて partition で切り出す。
+            serial, sep, rest = line.partition("\t")
+            if not sep:
+                continue
+            new_devices[serial] = self._parse_state(rest.partition("\t")[0])
+
+        # set(-, -, &) による差分は中間 set を 3 つ作り serial を再ハッシュする。
+        # dict を直接突き合わせれば 1 パス + 追加アロケーションなしで済む。
+        old_devices = self._current_devices
+
+        connected: list[tuple[str, DeviceState]] = []
+        disconnected: list[str] = []
+        changed: list[tuple[str, DeviceState]] = []
+
+        for serial, new_state in new_devices.items():
+            old_state = old_devices.get(serial)
+            if old_state is None:
+                logger.info(f"Device connected: {serial} ({new_state.value})")
+                connected.append((serial, new_state))
+            elif old_state != new_state:
+                logger.info(f"Device state changed: {serial} {old_state.value} -> {new_state.value}")
+                changed.append((serial, new_state))
 
-        old_serials = set(self._current_devices.keys())
-        new_serials = set(new_devices.keys())
+        for serial in old_devices:
+            if serial not in new_devices:
+                logger.info(f"Device disconnected: {serial}")
+                disconnected.append(serial)
 
-        for serial in new_serials - old_serials:
-            state = new_devices[serial]
-            logger.info(f"Device connected: {serial} ({state.value})")
-            for callback in self._on_connected:
-                try:
-                    callback(serial, state)
-                except Exception as e:
-                    logger.error(f"Error in on_connected callback: {e}")
+        self._current_devices = new_devices
 
-        for serial in old_serials - new_serials:
-            logger.info(f"Device disconnected: {serial}")
-            for callback in self._on_disconnected:
+        if connected or disconnected or changed:
+            for callback in self._on_batch_change:
                 try:
-                    callback(serial)
+                    callback(connected, disconnected, changed)
                 except Exception as e:
-                    logger.error(f"Error in on_disconnected callback: {e}")
-
-        for serial in old_serials & new_serials:
-            old_state = self._current_devices[serial]
-            new_state = new_devices[serial]
-            if old_state != new_state:
-                logger.info(f"Device state changed: {serial} {old_state.value} -> {new_state.value}")
-                for callback in self._on_state_changed:
-                    try:
-                        callback(serial, new_state)
-                    except Exception as e:
-                        logger.error(f"Error in on_state_changed callback: {e}")
-
-        self._current_devices = new_devices
+                    logger.error(f"Error in devices-changed callback: {e}")
 
-    def _parse_state(self, state_str: str) -> DeviceState:
-        state_map = {
-            "device": DeviceState.DEVICE,
-            "offline": DeviceState.OFFLINE,
-            "unauthorized": DeviceState.UNAUTHORIZED,
-            "connecting": DeviceState.CONNECTING,
-        }
-        return state_map.get(state_str.lower(), DeviceState.UNKNOWN)
+    @staticmethod
+    def _parse_state(state_str: str) -> DeviceState:
+        return _STATE_MAP.get(state_str.lower(), DeviceState.UNKNOWN)
 
     def get_current_devices(self) -> dict[str, DeviceState]:
         return self._current_devices.copy()
@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 
 from app.models.device import DeviceInfo, DeviceState
 
@@ -16,89 +16,113 @@ class DeviceRegistry:
     """デバイス情報を管理するレジストリ"""
 
     def __init__(self):
+        # dict の更新はすべて同期処理（await を挟まない）なので、単一イベント
+        # ループ上ではそれ自体がアトミック。読み取り（get/list_* — 圧倒的に
+        # 高頻度）がロックで書き込みと直列化される理由はないため Lock は持たない
+        # （WorkerRegistry / CaptureManager と同じ理由）。
         self._devices: dict[str, DeviceInfo] = {}
-        self._lock = asyncio.Lock()
+        self._details_callbacks: list[Callable[[], None]] = []
+        # 詳細取得の single-flight: register と update_state が近接して呼ばれると
+        # 同じ serial に対し adb getprop ×2 本の取得が二重に走るため、
+        # 実行中の serial を記録して重複起動を抑止する。
+        self._detail_fetches_inflight: set[str] = set()
 
-    async def register(self, serial: str, state: DeviceState) -> DeviceInfo:
-        async with self._lock:
-            if serial in self._devices:
-                device = self._devices[serial]
-                device.state = state
-                device.last_seen = datetime.now()
-            else:
-                device = DeviceInfo(
-                    serial=serial,
-                    state=state,
-                    is_emulator=self._is_emulator(serial),
-                )
-                self._devices[serial] = device
-
-                if state == DeviceState.DEVICE:
-                    asyncio.create_task(self._fetch_device_details(serial))
+    def on_details_updated(self, callback: Callable[[], None]) -> None:
+        """非同期のデバイス詳細取得が完了した時のコールバックを登録"""
+        self._details_callbacks.append(callback)
 
-            return device
+    async def register(self, serial: str, state: DeviceState) -> DeviceInfo:
+        if serial in self._devices:
+            device = self._devices[serial]
+            device.touch(state=state, last_seen=datetime.now())
+        else:
+            device = DeviceInfo(
+                serial=serial,
+                state=state,
+                is_emulator=self._is_emulator(serial),
+            )
+            self._devices[serial] = device
+
+            if state == DeviceState.DEVICE:
+                self._start_detail_fetch(serial)
+
+        return device
 
     async def unregister(self, serial: str) -> Optional[DeviceInfo]:
-        async with self._lock:
-            return self._devices.pop(serial, None)
+        return self._devices.pop(serial, None)
 
     async def update_state(self, serial: str, state: DeviceState) -> Optional[DeviceInfo]:
-        async with self._lock:
-            if serial in self._devices:
-                device = self._devices[serial]
-                device.state = state
-                device.last_seen = datetime.now()
+        if serial in self._devices:
+            device = self._devices[serial]
+            device.touch(state=state, last_seen=datetime.now())
 
-                if state == DeviceState.DEVICE and not device.model:
-                    asyncio.create_task(self._fetch_device_details(serial))
+            if state == DeviceState.DEVICE and not device.model:
+                self._start_detail_fetch(serial)
 
-                return device
-            return None
+            return device
+        return None
 
     async def get(self, serial: str) -> Optional[DeviceInfo]:
-        async with self._lock:
-            return self._devices.get(serial)
+        return self._devices.get(serial)
 
     async def list_all(self) -> list[DeviceInfo]:
-        async with self._lock:
-            return list(self._devices.values())
+        return list(self._devices.values())
 
     async def list_online(self) -> list[DeviceInfo]:
-        async with self._lock:
-            return [d for d in self._devices.values() if d.state == DeviceState.DEVICE]
+        return [d for d in self._devices.values() if d.state == DeviceState.DEVICE]
 
     def _is_emulator(self, serial: str) -> bool:
         return serial.startswith("emulator-")
 
+    def _start_detail_fetch(self, serial: str) -> None:
+        """詳細取得タスクを起動する（実行中ならスキップ）。"""
+        if serial in self._detail_fetches_inflight:
+            return
+        self._detail_fetches_inflight.add(serial)
+        asyncio.create_task(self._fetch_device_details(serial))
+
     async def _fetch_device_details(self, serial: str) -> None:
         try:
-            model_task = self._adb_getprop(serial, "ro.product.model")
-            manufacturer_task = self._adb_getprop(serial, "ro.product.manufacturer")
-
-            model, manufacturer = await asyncio.gather(model_task, manufacturer_task, return_exceptions=True)
-
-            async with self._lock:
-                if serial in self._devices:
-                    device = self._devices[serial]
-                    if isinstance(model, str):
-                        device.model = model
-                    if isinstance(manufacturer, str):
-                        device.manufacturer = manufacturer
-                    logger.info(f"Fetched details for {serial}: {manufacturer} {model}")
+            # adb の起動は 1 回あたり数十 ms かかる（接続セットアップ込み）。
+            # プロパティごとにプロセスを立てず、shell 1 回でまとめて取得する。
+            model, manufacturer = await self._adb_getprops(
+                serial, ("ro.product.model", "ro.product.manufacturer")
+            )
+
+            device = self._devices.get(serial)
+            if device is not None:
+                changes: dict = {}
+                if model:
+                    changes["model"] = model
+                if manufacturer:
+                    changes["manufacturer"] = manufacturer
+                if changes:
+                    device.touch(**changes)
+                logger.info(f"Fetched details for {serial}: {manufacturer} {model}")
+
+            for callback in self._details_callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Error in details callback: {e}")
 
         except Exception as e:
             logger.error(f"Failed to fetch device details for {serial}: {e}")
+        finally:
+            self._detail_fetches_inflight.discard(serial)
 
-    async def _adb_getprop(self, serial: str, prop: str) -> str:
+    async def _adb_getprops(self, serial: str, props: tuple[str, ...]) -> list[str]:
+        """複数プロパティを adb shell 1 回でまとめて取得する（1 行 = 1 プロパティ）"""
         proc = await asyncio.create_subprocess_exec(
             "adb",
             "-s",
             serial,
             "shell",
-            "getprop",
-            prop,
+            "; ".join(f"getprop {p}" for p in props),
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
         stdout, _ = await proc.communicate()
-        return stdout.decode().strip()
+        lines = stdout.decode().splitlines()
+        # getprop は未定義でも空行を返すが、出力が欠けても長さを揃えておく
+        return [lines[i].strip() if i < len(lines) else "" for i in range(len(props))]
@@ -35,7 +35,11 @@ class SSEManager:
             logger.info(f"SSE client disconnected. Total: {len(self._queues)}")
 
     async def broadcast(self, event: str, data: dict | list[dict]) -> None:
-        message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        await self.broadcast_serialized(event, json.dumps(data).encode())
+
+    async def broadcast_serialized(self, event: str, data: bytes) -> None:
+        """シリアライズ済みJSONをそのままブロードキャストする（再エンコード回避）"""
+        message = f"event: {event}\ndata: {data.decode()}\n\n"
 
         async with self._lock:
             queues = self._queues.copy()
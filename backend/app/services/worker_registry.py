@@ -11,20 +11,24 @@ The underlying video ingest is handled by android-screen-stream's StreamManager.
 from __future__ import annotations
 
 import asyncio
+import bisect
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from android_screen_stream import StreamManager
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceWorkerState:
     serial: str
     stream_clients: int = 0
     capture_clients: int = 0
-    last_activity: str = ""
+    # UNIX epoch 秒 (time.time())。接続/切断のたびに datetime.isoformat() を
+    # 組み立てるのは高くつくので float のまま持ち、ISO 文字列が必要になったら
+    # 表示側で変換する（現状 API はこのフィールドを返していない）。
+    last_activity: float = 0.0
     idle_stop_task: Optional[asyncio.Task[None]] = None
 
 
@@ -33,58 +37,62 @@ class WorkerRegistry:
         self._stream_manager = stream_manager
         self._idle_timeout_sec = float(idle_timeout_sec)
 
-        self._lock = asyncio.Lock()
+        # 接続カウントの更新はすべて同期処理（await を挟まない）なので、
+        # 単一イベントループ上ではそれ自体がアトミック。グローバルな
+        # asyncio.Lock を全デバイスの接続/切断で取り合う必要はない
+        # （CaptureManager のレジストリ操作と同じ理由）。
         self._states: dict[str, DeviceWorkerState] = {}
+        # serial 順を接続時に bisect.insort で維持する（/sessions が毎回
+        # set union + sorted() をやり直さずに済むように）。エントリは削除されない。
+        self._sorted_serials: list[str] = []
+
+    def _get_or_create_state(self, serial: str) -> DeviceWorkerState:
+        st = self._states.get(serial)
+        if st is None:
+            st = DeviceWorkerState(serial=serial)
+            self._states[serial] = st
+            bisect.insort(self._sorted_serials, serial)
+        return st
 
     async def on_stream_connect(self, serial: str) -> None:
-        async with self._lock:
-            st = self._states.get(serial)
-            if st is None:
-                st = DeviceWorkerState(serial=serial)
-                self._states[serial] = st
-
-            st.stream_clients += 1
-            st.last_activity = datetime.now(timezone.utc).isoformat()
-            if st.idle_stop_task:
-                st.idle_stop_task.cancel()
-                st.idle_stop_task = None
+        st = self._get_or_create_state(serial)
+
+        st.stream_clients += 1
+        st.last_activity = time.time()
+        if st.idle_stop_task:
+            st.idle_stop_task.cancel()
+            st.idle_stop_task = None
 
     async def on_stream_disconnect(self, serial: str) -> None:
-        async with self._lock:
-            st = self._states.get(serial)
-            if st is None:
-                return
+        st = self._states.get(serial)
+        if st is None:
+            return
 
-            st.stream_clients = max(0, st.stream_clients - 1)
-            st.last_activity = datetime.now(timezone.utc).isoformat()
+        st.stream_clients = max(0, st.stream_clients - 1)
+        st.last_activity = time.time()
 
-            await self._schedule_idle_stop_locked(st)
+        self._schedule_idle_stop(st)
 
     async def on_capture_connect(self, serial: str) -> None:
-        async with self._lock:
-            st = self._states.get(serial)
-            if st is None:
-                st = DeviceWorkerState(serial=serial)
-                self._states[serial] = st
-
-            st.capture_clients += 1
-            st.last_activity = datetime.now(timezone.utc).isoformat()
-            if st.idle_stop_task:
-                st.idle_stop_task.cancel()
-                st.idle_stop_task = None
+        st = self._get_or_create_state(serial)
+
+        st.capture_clients += 1
+        st.last_activity = time.time()
+        if st.idle_stop_task:
+            st.idle_stop_task.cancel()
+            st.idle_stop_task = None
 
     async def on_capture_disconnect(self, serial: str) -> None:
-        async with self._lock:
-            st = self._states.get(serial)
-            if st is None:
-                return
+        st = self._states.get(serial)
+        if st is None:
+            return
 
-            st.capture_clients = max(0, st.capture_clients - 1)
-            st.last_activity = datetime.now(timezone.utc).isoformat()
+        st.capture_clients = max(0, st.capture_clients - 1)
+        st.last_activity = time.time()
 
-            await self._schedule_idle_stop_locked(st)
+        self._schedule_idle_stop(st)
 
-    async def _schedule_idle_stop_locked(self, st: DeviceWorkerState) -> None:
+    def _schedule_idle_stop(self, st: DeviceWorkerState) -> None:
         if st.stream_clients != 0 or st.capture_clients != 0:
             return
 
@@ -98,23 +106,22 @@ class WorkerRegistry:
             await asyncio.sleep(self._idle_timeout_sec)
             await self._stream_manager.stop_session(serial)
         finally:
-            async with self._lock:
-                st = self._states.get(serial)
-                if st and st.stream_clients == 0 and st.capture_clients == 0:
-                    st.idle_stop_task = None
+            st = self._states.get(serial)
+            if st and st.stream_clients == 0 and st.capture_clients == 0:
+                st.idle_stop_task = None
 
     async def snapshot(self) -> list[DeviceWorkerState]:
-        async with self._lock:
-            return [
-                DeviceWorkerState(
-                    serial=s.serial,
-                    stream_clients=s.stream_clients,
-                    capture_clients=s.capture_clients,
-                    last_activity=s.last_activity,
-                    idle_stop_task=None,
-                )
-                for s in self._states.values()
-            ]
+        """登録済みデバイスの状態一覧を serial 昇順で返す。"""
+        return [
+            DeviceWorkerState(
+                serial=s.serial,
+                stream_clients=s.stream_clients,
+                capture_clients=s.capture_clients,
+                last_activity=s.last_activity,
+                idle_stop_task=None,
+            )
+            for s in (self._states[serial] for serial in self._sorted_serials)
+        ]
 
 
 _worker_registry: Optional[WorkerRegistry] = None
@@ -90,7 +90,9 @@ echo "=== Setup complete ==="
 if [[ "$SETUP_ONLY" == true ]]; then
     echo ""
     echo "To start the backend, run:"
-    echo "  cd backend && uv run uvicorn app.main:app --host $HOST --port $PORT --reload"
+    echo "  cd backend && uv run uvicorn app.main:app --host $HOST --port $PORT --reload \\"
+    echo "      --loop uvloop --http httptools --ws websockets \\"
+    echo "      --ws-max-size 8388608 --ws-per-message-deflate false"
     exit 0
 fi
 
@@ -108,5 +110,8 @@ echo ""
 # 環境変数を設定（Docker と違い、ローカルでは実際のパスを指定）
 export SCRCPY_SERVER_JAR="$PROJECT_ROOT/vendor/scrcpy-server.jar"
 
-# バックエンド起動
-exec uv run uvicorn app.main:app --host "$HOST" --port "$PORT" --reload
+# バックエンド起動（loop/ws 設定は Dockerfile の CMD と揃える:
+# uvloop + websockets、permessage-deflate 無効、WS 最大 8MB）
+exec uv run uvicorn app.main:app --host "$HOST" --port "$PORT" --reload \
+    --loop uvloop --http httptools --ws websockets \
+    --ws-max-size 8388608 --ws-per-message-deflate false
@@ -1,5 +1,5 @@
 import asyncio
-from datetime import datetime, timezone
+import time
 
 import pytest
 
@@ -14,14 +14,13 @@ async def test_get_latest_frame_default_returns_immediately_when_available() ->
         width=10,
         height=10,
         pix_fmt="yuv420p",
-        captured_at=datetime.now(timezone.utc).isoformat(),
+        captured_ns=time.time_ns(),
         data=b"x" * 150,
     )
 
-    async with worker._cond:
-        worker._latest_frame = fb
-        worker._seq = 123
-        worker._cond.notify_all()
+    worker._latest_frame = fb
+    worker._seq = 123
+    worker._new_frame_event.set()
 
     # Should not wait.
     got = await asyncio.wait_for(
@@ -39,14 +38,13 @@ async def test_get_latest_frame_wait_for_new_frame_falls_back_on_timeout() -> No
         width=10,
         height=10,
         pix_fmt="yuv420p",
-        captured_at=datetime.now(timezone.utc).isoformat(),
+        captured_ns=time.time_ns(),
         data=b"x" * 150,
     )
 
-    async with worker._cond:
-        worker._latest_frame = fb
-        worker._seq = 1
-        worker._cond.notify_all()
+    worker._latest_frame = fb
+    worker._seq = 1
+    worker._new_frame_event.set()
 
     # No new frame will arrive, so it should time out and return existing frame.
     got = await worker._get_latest_frame(timeout_sec=0.01, wait_for_new_frame=True)
@@ -61,16 +59,15 @@ async def test_get_latest_frame_waits_for_first_frame_when_none_available() -> N
         width=10,
         height=10,
         pix_fmt="yuv420p",
-        captured_at=datetime.now(timezone.utc).isoformat(),
+        captured_ns=time.time_ns(),
         data=b"x" * 150,
     )
 
     async def publish_first_frame() -> None:
         await asyncio.sleep(0.01)
-        async with worker._cond:
-            worker._latest_frame = fb
-            worker._seq += 1
-            worker._cond.notify_all()
+        worker._latest_frame = fb
+        worker._seq += 1
+        worker._new_frame_event.set()
 
     pub_task = asyncio.create_task(publish_first_frame())
     try:
@@ -20,6 +20,7 @@
 
 from __future__ import annotations
 
+import json
 import subprocess
 from pathlib import Path
 
@@ -29,6 +30,16 @@ from httpx import AsyncClient, ASGITransport
 from app.main import create_app
 
 
+def _parse_capture_frame(frame: bytes) -> tuple[dict, bytes]:
+    """キャプチャ応答の単一バイナリフレームを (header, jpeg) に分解する"""
+    assert len(frame) >= 4, "Frame too short for header length prefix"
+    header_len = int.from_bytes(frame[:4], "big")
+    assert len(frame) >= 4 + header_len, "Frame truncated"
+    header = json.loads(frame[4 : 4 + header_len])
+    assert header.get("type") == "capture_result", f"Unexpected header: {header}"
+    return header, frame[4 + header_len :]
+
+
 def get_connected_devices() -> list[str]:
     """adb devices で接続中のデバイスシリアルを取得"""
     result = subprocess.run(
@@ -126,29 +137,25 @@ def test_capture_jpeg_via_websocket(
             "save": False,
         })
         
-        # メタデータを受信（最大60秒待機）
+        # レスポンスを受信（最大60秒待機）
+        # 成功時は [4B BE header_len][header JSON][JPEG] の単一バイナリフレーム
         result = None
+        jpeg_bytes = b""
         for _ in range(60):
             try:
-                msg = ws.receive_json()
-                if msg.get("type") == "capture_result":
-                    result = msg
-                    break
-                elif msg.get("type") == "error":
-                    pytest.fail(f"Capture error: {msg}")
+                frame = ws.receive_bytes()
+                result, jpeg_bytes = _parse_capture_frame(frame)
+                break
             except Exception as e:
                 print(f"Waiting for response: {e}")
                 time.sleep(1.0)
-        
+
         assert result is not None, "Did not receive capture_result"
         assert result["serial"] == connected_device
         assert result["width"] > 0
         assert result["height"] > 0
         assert result["bytes"] > 0
-        
-        # JPEG バイナリを受信
-        jpeg_bytes = ws.receive_bytes()
-        
+
         # JPEG フォーマットの検証
         assert jpeg_bytes.startswith(b"\xff\xd8"), "Should start with JPEG SOI marker"
         assert jpeg_bytes.endswith(b"\xff\xd9"), "Should end with JPEG EOI marker"
@@ -178,28 +185,30 @@ def test_capture_jpeg_saves_to_file(
         })
         
         result = None
+        jpeg_bytes = b""
         for _ in range(60):
             try:
-                msg = ws.receive_json()
-                if msg.get("type") == "capture_result":
-                    result = msg
-                    break
-                elif msg.get("type") == "error":
-                    pytest.fail(f"Capture error: {msg}")
+                frame = ws.receive_bytes()
+                result, jpeg_bytes = _parse_capture_frame(frame)
+                break
             except Exception as e:
                 print(f"Waiting for response: {e}")
                 time.sleep(1.0)
-        
+
         assert result is not None, "Did not receive capture_result"
         assert result["path"] is not None, "Path should be set when save=True"
-        
-        # ファイルが存在することを確認
+
+        # ファイルが存在することを確認。保存は背景ライタが非同期に行うため、
+        # 応答直後はまだ書き込み前/書き込み中のことがある。サイズが一致する
+        # まで少し待ってから中身を検証する。
         saved_path = Path(result["path"])
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            if saved_path.exists() and saved_path.stat().st_size == len(jpeg_bytes):
+                break
+            time.sleep(0.1)
         assert saved_path.exists(), f"Saved file should exist: {saved_path}"
-        
-        # JPEG バイナリも受信
-        jpeg_bytes = ws.receive_bytes()
-        
+
         # 保存されたファイルの内容が一致することを確認
         saved_bytes = saved_path.read_bytes()
         assert saved_bytes == jpeg_bytes
@@ -259,19 +268,16 @@ def test_multiple_devices_capture(test_client) -> None:
             })
             
             result = None
+            jpeg_bytes = b""
             for _ in range(60):
                 try:
-                    msg = ws.receive_json()
-                    if msg.get("type") == "capture_result":
-                        result = msg
-                        break
-                    elif msg.get("type") == "error":
-                        pytest.fail(f"Capture error for {device}: {msg}")
+                    frame = ws.receive_bytes()
+                    result, jpeg_bytes = _parse_capture_frame(frame)
+                    break
                 except Exception:
                     time.sleep(1.0)
-            
+
             if result:
-                jpeg_bytes = ws.receive_bytes()
                 results[device] = {
                     "width": result["width"],
                     "height": result["height"],
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from app.services.capture_manager import _find_sps_bounds, _parse_sps_dimensions
+
+# x264 が生成した 1920x1080 High profile の SPS（NAL ヘッダ 0x67 を除く）
+_SPS_1080P = bytes.fromhex("640028acd940780227e584000003000400000300f03c60c658")
+
+
+def test_parse_sps_dimensions_known_1080p() -> None:
+    assert _parse_sps_dimensions(_SPS_1080P) == (1920, 1080)
+
+
+def test_parse_sps_dimensions_garbage_returns_none() -> None:
+    assert _parse_sps_dimensions(b"") is None
+    assert _parse_sps_dimensions(b"\x00\x01") is None
+
+
+def test_find_sps_bounds_in_annexb_chunk() -> None:
+    chunk = b"\x00\x00\x00\x01\x67" + _SPS_1080P + b"\x00\x00\x00\x01\x68\xee\x3c\x80"
+    bounds = _find_sps_bounds(chunk)
+    assert bounds is not None
+    start, end = bounds
+    # NAL ヘッダ込みで SPS のみ（次の start code の先頭 0x00 は含まない）
+    assert chunk[start] == 0x67
+    assert chunk[start + 1 : end] == _SPS_1080P
+
+
+def test_find_sps_bounds_absent() -> None:
+    assert _find_sps_bounds(b"\x00\x00\x00\x01\x41\xaa\xbb") is None
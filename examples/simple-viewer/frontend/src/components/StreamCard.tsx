@@ -59,20 +59,24 @@ export function StreamCard({
               setCaptureError(`${msg.code ?? 'ERROR'}: ${msg.message ?? 'unknown error'}`)
               return
             }
-            if (msg.type === 'capture_result') {
-              pendingCaptureIdRef.current = msg.capture_id
-              return
-            }
           } catch (e) {
             console.error('Failed to parse capture message:', e)
           }
           return
         }
 
-        // Binary (JPEG bytes) - display as overlay instead of download
+        // Binary: [4B BE header_len][header JSON][JPEG bytes] in a single frame
         try {
           const buf = event.data as ArrayBuffer
-          const blob = new Blob([buf], { type: 'image/jpeg' })
+          const headerLen = new DataView(buf).getUint32(0)
+          const header = JSON.parse(
+            new TextDecoder().decode(new Uint8Array(buf, 4, headerLen))
+          )
+          if (header.type === 'capture_result') {
+            pendingCaptureIdRef.current = header.capture_id
+          }
+          const jpeg = new Uint8Array(buf, 4 + headerLen)
+          const blob = new Blob([jpeg], { type: 'image/jpeg' })
           
           // Revoke previous URL if exists
           if (captureImageUrl) {
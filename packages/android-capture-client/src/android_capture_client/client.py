@@ -194,35 +194,37 @@ class CaptureClient:
         logger.debug(f"Sent capture request: quality={quality}, save={save}")
 
         try:
-            # Receive JSON metadata
-            raw_meta = await asyncio.wait_for(
+            # Receive the response. A successful capture is a single binary frame:
+            # [4 bytes big-endian header_len][header JSON][JPEG bytes].
+            # Errors are still sent as a text JSON frame.
+            raw = await asyncio.wait_for(
                 self._ws.recv(),
                 timeout=self.capture_timeout,
             )
-            
-            if isinstance(raw_meta, bytes):
-                raise CaptureError("PROTOCOL_ERROR", "Expected JSON metadata, got binary")
-            
-            metadata = json.loads(raw_meta)
-            
-            # Check for error response
-            if metadata.get("type") == "error":
+
+            if isinstance(raw, str):
+                metadata = json.loads(raw)
+                if metadata.get("type") == "error":
+                    raise CaptureError(
+                        metadata.get("code", "UNKNOWN"),
+                        metadata.get("message", "Unknown error"),
+                    )
                 raise CaptureError(
-                    metadata.get("code", "UNKNOWN"),
-                    metadata.get("message", "Unknown error"),
+                    "PROTOCOL_ERROR", f"Unexpected message type: {metadata.get('type')}"
                 )
-            
+
+            if len(raw) < 4:
+                raise CaptureError("PROTOCOL_ERROR", "Binary frame too short for header")
+
+            header_len = int.from_bytes(raw[:4], "big")
+            if len(raw) < 4 + header_len:
+                raise CaptureError("PROTOCOL_ERROR", "Binary frame truncated")
+
+            metadata = json.loads(raw[4 : 4 + header_len])
             if metadata.get("type") != "capture_result":
                 raise CaptureError("PROTOCOL_ERROR", f"Unexpected message type: {metadata.get('type')}")
 
-            # Receive JPEG binary
-            jpeg_data = await asyncio.wait_for(
-                self._ws.recv(),
-                timeout=self.capture_timeout,
-            )
-            
-            if not isinstance(jpeg_data, bytes):
-                raise CaptureError("PROTOCOL_ERROR", "Expected binary JPEG data")
+            jpeg_data = raw[4 + header_len :]
 
             logger.debug(f"Received capture: {metadata.get('width')}x{metadata.get('height')}, {len(jpeg_data)} bytes")
 
@@ -6,6 +6,7 @@ StreamSession - マルチキャスト対応のストリーミングセッショ
 
 import asyncio
 import logging
+from collections import deque
 from dataclasses import dataclass
 from typing import AsyncIterator, Optional
 
@@ -44,16 +45,15 @@ class _H264UnitExtractor:
         return buf.startswith(b"\x00\x00\x01") or buf.startswith(b"\x00\x00\x00\x01")
 
     def _find_start_code(self, buf: bytearray) -> int:
-        n = len(buf)
-        i = 0
-        while i < n - 3:
-            if buf[i] == 0 and buf[i + 1] == 0:
-                if buf[i + 2] == 1:
-                    return i
-                if i < n - 4 and buf[i + 2] == 0 and buf[i + 3] == 1:
-                    return i
-            i += 1
-        return -1
+        # 00 00 01 を C 実装の find (memchr ベース) で探す。直前が 0x00 なら
+        # 4byte 形式 (00 00 00 01) なのでその先頭を返す。Python のバイト単位
+        # ループと同じ結果を桁違いに速く返す。
+        idx = buf.find(b"\x00\x00\x01")
+        if idx < 0:
+            return -1
+        if idx > 0 and buf[idx - 1] == 0:
+            return idx - 1
+        return idx
 
     def _looks_like_avcc_at(self, buf: bytearray, offset: int) -> bool:
         if offset + 5 > len(buf):
@@ -96,19 +96,20 @@ class _H264UnitExtractor:
         if n < 4:
             return []
 
+        # start code の走査はホットパス（チャンクごとに全バイトを見る）なので、
+        # C 実装の find に任せる。4byte 形式は直前の 0x00 を含めて先頭とする。
         starts: list[int] = []
+        find = buf.find
         i = 0
-        while i < n - 3:
-            if buf[i] == 0 and buf[i + 1] == 0:
-                if buf[i + 2] == 1:
-                    starts.append(i)
-                    i += 3
-                    continue
-                if i < n - 4 and buf[i + 2] == 0 and buf[i + 3] == 1:
-                    starts.append(i)
-                    i += 4
-                    continue
-            i += 1
+        while True:
+            idx = find(b"\x00\x00\x01", i)
+            if idx < 0:
+                break
+            if idx > 0 and buf[idx - 1] == 0:
+                starts.append(idx - 1)
+            else:
+                starts.append(idx)
+            i = idx + 3
 
         if not starts:
             return []
@@ -179,6 +180,27 @@ def _nal_type(nal: bytes) -> Optional[int]:
     return None
 
 
+class _Subscriber:
+    """購読者ごとの配信キュー（deque + Event）。
+
+    asyncio.Queue.put_nowait は waiter 管理や _finished カウンタの機構を
+    毎回通る。配信側（毎 NAL × 購読者数）は deque.append + Event.set だけに
+    絞り、取り出し側が event を待って deque を空になるまで popleft する。
+    maxlen 付き deque なので追いつけない購読者は最古の NAL から自然に落ちる
+    （QueueFull で最新を落とすより追いつき後の復帰が早い）。
+    """
+
+    __slots__ = ("chunks", "event")
+
+    def __init__(self, maxlen: int) -> None:
+        self.chunks: deque[bytes] = deque(maxlen=maxlen)
+        self.event = asyncio.Event()
+
+    def push(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+        self.event.set()
+
+
 @dataclass
 class StreamStats:
     """ストリーム統計情報"""
@@ -225,7 +247,10 @@ class StreamSession:
         
         self._client: Optional[ScrcpyClient] = None
         self._running = False
-        self._subscribers: list[asyncio.Queue[bytes]] = []
+        # 購読者は copy-on-write な tuple で持つ。追加/削除（稀）は _lock 下で
+        # 新しい tuple に差し替え、配信ループ（毎 NAL）は参照を読むだけで
+        # ロックなしに安全にイテレートできる。
+        self._subscribers: tuple[_Subscriber, ...] = ()
         self._lock = asyncio.Lock()
         self._subscribe_lock = asyncio.Lock()
         self._broadcast_task: Optional[asyncio.Task] = None
@@ -299,12 +324,9 @@ class StreamSession:
         
         # 購読者に終了を通知
         async with self._lock:
-            for queue in self._subscribers:
-                try:
-                    queue.put_nowait(b"")
-                except asyncio.QueueFull:
-                    pass
-            self._subscribers.clear()
+            for sub in self._subscribers:
+                sub.push(b"")
+            self._subscribers = ()
             self._stats.subscriber_count = 0
         
         logger.info(f"Stream session stopped for {self.serial}")
@@ -322,7 +344,7 @@ class StreamSession:
             await self.stop()
             await self.start()
     
-    async def subscribe(self) -> AsyncIterator[bytes]:
+    async def subscribe(self, *, coalesce_bytes: int = 0) -> AsyncIterator[bytes]:
         """ストリームを購読
 
         ブラウザ側(JMuxer)は raw H.264 を受けて fMP4 を生成するため、途中参加(late join)
@@ -331,6 +353,12 @@ class StreamSession:
         そのため、サーバ側で直近の SPS/PPS と「最新GOP(IDR〜現在)」を保持し、
         新規参加時に必ず "初期化できる塊" (SPS + PPS + IDR + 以降のフレーム) を先に送る。
         
+        Args:
+            coalesce_bytes: 0より大きい場合、キューに溜まっている NAL をこのサイズ
+                まで結合して 1 チャンクとして yield する。Annex-B は自己区切りなので
+                連結してもプロトコル互換で、小さい NAL が多い場面で送信回数
+                （WSフレーム / syscall）を削減できる。0 で従来どおり NAL 単位。
+
         Yields:
             bytes: H.264 データチャンク
         """
@@ -359,18 +387,15 @@ class StreamSession:
             async with self._lock:
                 late_join = len(self._subscribers) > 0
                 gop_snapshot = list(self._gop_nals) if (late_join and self._gop_has_idr) else []
-                # スナップショット分 + 余裕
+                # スナップショット分 + 余裕（qsize は常に snapshot より大きいので
+                # prefill が maxlen で欠けることはない）
                 qsize = max(200, len(gop_snapshot) + 200)
-                queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=qsize)
+                sub = _Subscriber(maxlen=qsize)
 
                 for nal in gop_snapshot:
-                    try:
-                        queue.put_nowait(nal)
-                    except asyncio.QueueFull:
-                        # 想定外: 初期化塊が入らないと意味がないので、ここは落とす
-                        raise RuntimeError("GOP snapshot queue overflow")
+                    sub.chunks.append(nal)
 
-                self._subscribers.append(queue)
+                self._subscribers = self._subscribers + (sub,)
                 self._stats.subscriber_count = len(self._subscribers)
                 state = "late-join" if late_join else "active"
 
@@ -378,25 +403,52 @@ class StreamSession:
                 f"New subscriber for {self.serial}. state={state} subscribers={len(self._subscribers)} gop_prefill_nals={len(gop_snapshot)}"
             )
         
+        # coalesce 用スクラッチ（購読者ごとに再利用。結合しない場合は未使用）
+        scratch = bytearray()
         try:
             while True:
-                try:
-                    chunk = await asyncio.wait_for(queue.get(), timeout=30.0)
-                except asyncio.TimeoutError:
-                    if not self._running:
-                        break
+                if not sub.chunks:
+                    # 空のときだけ clear→wait。emptiness 判定〜clear の間に
+                    # await が無いのでシグナルを取りこぼすことはない。
+                    sub.event.clear()
+                    try:
+                        await asyncio.wait_for(sub.event.wait(), timeout=30.0)
+                    except asyncio.TimeoutError:
+                        if not self._running:
+                            break
                     continue
 
+                chunk = sub.chunks.popleft()
+
                 if not chunk:  # 終了シグナル
                     break
-                yield chunk
+
+                if coalesce_bytes <= 0 or not sub.chunks:
+                    # 通常ケース: キューが空なら結合しようがないので、そのままゼロコピーで返す
+                    yield chunk
+                    continue
+
+                # 既に到着している NAL を上限まで結合して 1 チャンクで返す。
+                # 待ちは一切入れない（遅延を増やさずに送信回数だけ減らす）。
+                scratch.clear()
+                scratch += chunk
+                eof = False
+                while len(scratch) < coalesce_bytes and sub.chunks:
+                    more = sub.chunks.popleft()
+                    if not more:  # 終了シグナル
+                        eof = True
+                        break
+                    scratch += more
+                yield bytes(scratch)
+                if eof:
+                    break
         finally:
-            async with self._lock:
-                if queue in self._subscribers:
-                    self._subscribers.remove(queue)
-                self._stats.subscriber_count = len(self._subscribers)
+            # COW tuple の差し替え〜カウント更新は await を挟まない同期処理なので
+            # イベントループ上でアトミック。切断のたびにロックを取る必要はない。
+            self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+            self._stats.subscriber_count = len(self._subscribers)
 
-                subscribers = len(self._subscribers)
+            subscribers = len(self._subscribers)
             logger.info(f"Subscriber removed for {self.serial}. subscribers={subscribers}")
             
             # 購読者がいなくなったら遅延停止
@@ -409,9 +461,7 @@ class StreamSession:
         """遅延停止（再接続の猶予）"""
         try:
             await asyncio.sleep(5.0)
-            async with self._lock:
-                should_stop = len(self._subscribers) == 0
-            if should_stop:
+            if len(self._subscribers) == 0:
                 await self.stop()
         finally:
             self._delayed_stop_task = None
@@ -484,7 +534,10 @@ class StreamSession:
         nal_count = 0
         prev_chunk_t: float | None = None
         prev_nal_t: float | None = None
-        
+        # 統計はローカルに積んで TCP chunk ごとに 1 回だけ _stats へ反映する
+        # （毎 NAL の属性参照 2 回 + 加算 2 回を避ける）
+        stats = self._stats
+
         try:
             async for chunk in self._client.stream():
                 if not self._running:
@@ -503,22 +556,18 @@ class StreamSession:
                 
                 # raw chunk を NAL unit に分解して配信する（late join の順序保証のため）
                 nals = self._extractor.push(chunk)
+                chunk_nal_bytes = 0
                 for nal in nals:
                     self._update_gop_cache(nal)
 
-                    self._stats.bytes_sent += len(nal)
-                    self._stats.chunks_sent += 1
+                    chunk_nal_bytes += len(nal)
                     nal_count += 1
 
-                    async with self._lock:
-                        subscribers = list(self._subscribers)
-
-                    for queue in subscribers:
-                        try:
-                            queue.put_nowait(nal)
-                        except asyncio.QueueFull:
-                            # 追いつけないクライアントはドロップ（他への配信を優先）
-                            pass
+                    # _subscribers は COW tuple なので参照を読むだけでよい
+                    # （差し替えはアトミック、毎 NAL のロック取得が不要になる）。
+                    # 追いつけない購読者は maxlen deque が最古から落とす。
+                    for sub in self._subscribers:
+                        sub.push(nal)
                     
                     send_t = time.perf_counter()
                     process_ms = (send_t - chunk_recv_t) * 1000
@@ -528,6 +577,10 @@ class StreamSession:
                         logger.info(
                             f"[BACKEND_LATENCY] nal={nal_count} process_ms={process_ms:.3f}"
                         )
+
+                if nals:
+                    stats.bytes_sent += chunk_nal_bytes
+                    stats.chunks_sent += len(nals)
         except Exception as e:
             logger.error(f"Broadcast error for {self.serial}: {e}")
         finally:
@@ -624,11 +677,26 @@ class StreamManager:
                 await session.stop()
     
     async def stop_all(self) -> None:
-        """全セッションを停止"""
+        """全セッションを停止
+
+        停止はセッションごとにプロセス終了待ちを含むため、直列だと
+        所要時間がセッション数に比例する。TaskGroup で並列に止めて
+        max(各停止時間) に抑える（シャットダウン時に効く）。
+        """
         async with self._lock:
-            for session in self._sessions.values():
-                await session.stop()
+            sessions = list(self._sessions.values())
             self._sessions.clear()
+
+        if not sessions:
+            return
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for session in sessions:
+                    tg.create_task(session.stop())
+        except* Exception as eg:
+            for exc in eg.exceptions:
+                logger.error(f"Error stopping session: {exc}")
     
     def get_session(self, serial: str) -> Optional[StreamSession]:
         """セッションを取得 (存在しない場合は None)"""